@@ -2,3 +2,17 @@ from .core import *
 from . import neural_net as nn
 from .neural_net import *
 from . import verbosity
+from . import profiler
+from . import tracer
+from .framework_handler import pin
+
+
+_backends = ['numpy', 'jax', 'tensorflow', 'torch', 'mxnd', 'mxsym']
+
+
+def __getattr__(name):
+    # backends are only imported on first access, so that importing ivy does not import any framework
+    if name in _backends:
+        import importlib
+        return importlib.import_module('ivy.' + name)
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
@@ -1,5 +1,7 @@
 from . import container
 from .container import *
+from . import container_io
+from .container_io import *
 from . import general
 from .general import *
 from . import gradients
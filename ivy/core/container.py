@@ -3,25 +3,151 @@ Base Container Object
 """
 
 # global
+import os as _os
+import atexit as _atexit
+import time as _time
 import random as _random
-import h5py as _h5py
+import threading as _threading
+import weakref as _weakref
+import importlib as _importlib
+import contextvars as _contextvars
 import numpy as _np
 from functools import reduce as _reduce
 from operator import mul as _mul
-try:
-    import jax.numpy as _jpn
-except ImportError:
-    _jpn = None
 
 # local
 from ivy.core import general as _ivy_gen
 from ivy.core import random as _ivy_rand
+from ivy.core import container_io as _ivy_cont_io
+from ivy import framework_handler as _framework_handler
 from ivy.framework_handler import get_framework as _get_framework
 
 
+# use processes -> executor of the default size, shared by all parallel Container.map calls and shut down at exit
+_map_executors = dict()
+_map_executors_lock = _threading.Lock()
+_map_worker_local = _threading.local()
+
+
+def _mark_map_worker():
+    _map_worker_local.is_worker = True
+
+
+def _new_map_executor(processes, max_workers=None):
+    from concurrent import futures
+    if processes:
+        return futures.ProcessPoolExecutor(max_workers, initializer=_mark_map_worker)
+    return futures.ThreadPoolExecutor(max_workers, initializer=_mark_map_worker)
+
+
+def _map_executor(processes):
+    with _map_executors_lock:
+        if processes not in _map_executors:
+            _map_executors[processes] = _new_map_executor(processes)
+        return _map_executors[processes]
+
+
+def _shutdown_map_executors():
+    with _map_executors_lock:
+        for executor in _map_executors.values():
+            executor.shutdown()
+        _map_executors.clear()
+
+
+_atexit.register(_shutdown_map_executors)
+
+
+def _call_with_framework_stack(func, framework_names, value, key_chain):
+    # worker processes do not share the context of the caller, so its framework stack is set up around each call
+    for framework_name in framework_names:
+        _framework_handler.set_framework(_importlib.import_module(framework_name))
+    try:
+        return func(value, key_chain)
+    finally:
+        for _ in framework_names:
+            _framework_handler.unset_framework()
+
+
+def _map_leaves(executor, processes, func, values, key_chains, num_workers):
+    if processes:
+        framework_names = [f.__name__ for f in _framework_handler.framework_stack]
+        chunksize = max(len(values) // (4 * num_workers), 1)
+        return list(executor.map(_call_with_framework_stack, [func] * len(values), [framework_names] * len(values),
+                                 values, key_chains, chunksize=chunksize))
+    # each call runs in its own copy of the caller's context, which holds the framework stack
+    submitted = [executor.submit(_contextvars.copy_context().run, func, value, key_chain)
+                 for value, key_chain in zip(values, key_chains)]
+    return [future.result() for future in submitted]
+
+
+# frameworks whose arrays are taken along axis 0 with a flat index array, rather than with a gather
+_NATIVE_TAKE_FRAMEWORKS = ['ivy.jax', 'ivy.torch', 'ivy.tensorflow']
+
+
+def _join_key_chain(key_chain, keys):
+    return key_chain + '/' + '/'.join([str(key) for key in keys])
+
+
+class _TreeDef:
+    """
+    Hashable structure of a container, as nested tuples of (key, sub-structure or None for a leaf) in sorted key order.
+    The hash is computed once, so that the structure can be compared cheaply, for example as a cache key.
+    """
+
+    __slots__ = ['nodes', '_hash']
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self._hash = hash(nodes)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return self is other or (isinstance(other, _TreeDef) and self._hash == other._hash and
+                                 self.nodes == other.nodes)
+
+    def __repr__(self):
+        return '_TreeDef({})'.format(self.nodes)
+
+
+def _slice_leaf(value, dim, index):
+    # slice of size one along dim, or the value itself if it cannot be sliced
+    # noinspection PyBroadException
+    try:
+        return value[tuple([slice(None, None, None)] * dim + [slice(index, index + 1, 1)])]
+    except Exception:
+        return value
+
+
+def _tree_nodes(container, leaves):
+    nodes = list()
+    for key, value in sorted(container.items()):
+        if isinstance(value, Container):
+            value._link_parent(container)
+            nodes.append((key, _tree_nodes(value, leaves)))
+        else:
+            leaves.append(value)
+            nodes.append((key, None))
+    return tuple(nodes)
+
+
+def _container_from_tree_nodes(nodes, leaves_iter):
+    return Container._from_sorted({key: next(leaves_iter) if sub_nodes is None else
+                                   _container_from_tree_nodes(sub_nodes, leaves_iter) for key, sub_nodes in nodes})
+
+
 # noinspection PyMissingConstructor
 class Container(dict):
 
+    # incremented after every mutation of this container or of any sub-container linked to it, invalidating the
+    # cached indices of this container
+    _version = 0
+    # (version, leaf entries, key chain to value dict) of the cached flat index
+    _flat = None
+    # (version, leaves, tree structure) of the cached flattened tree
+    _tree = None
+
     def __init__(self, dict_in=None):
         """
         Initialize container object from input dict representation.
@@ -30,11 +156,12 @@ class Container(dict):
             dict_in = dict()
         if not isinstance(dict_in, dict):
             dict_in = dict(dict_in)
+        # a new container cannot be in any cached flat index yet, so filling it is not counted as a mutation
         for key, value in sorted(dict_in.items()):
             if isinstance(value, dict):
-                self[key] = Container(value)
+                dict.__setitem__(self, key, Container(value))
             else:
-                self[key] = value
+                dict.__setitem__(self, key, value)
 
         self._size = self._get_size()
 
@@ -74,9 +201,24 @@ class Container(dict):
                 raise Exception(str(e) + '\nContainer concat operation only valid for containers of arrays')
 
     @staticmethod
-    def from_disk(h5_obj_or_filepath, f, slice_obj=slice(None)):
+    def unflatten(treedef, leaves):
+        """
+        Reconstruct a container from its tree structure and leaves, as returned by Container.flatten.
+
+        :param treedef: Tree structure of the container.
+        :type treedef: hashable tree structure
+        :param leaves: Leaves of the container, in the order returned by Container.flatten.
+        :type leaves: sequence of arrays
+        :return: Reconstructed container.
+        """
+        return _container_from_tree_nodes(treedef.nodes, iter(leaves))
+
+    @staticmethod
+    def from_disk(h5_obj_or_filepath, f, slice_obj=slice(None), out=None, lazy=False, cache_size=int(2**26)):
         """
         Load container object from disk, as an h5py file, at the specified filepath.
+        Each dataset is read into a numpy array, which is passed directly to the framework, without any intermediate
+        python lists.
 
         :param h5_obj_or_filepath: Filepath where the container object is saved to disk, or h5 object.
         :type h5_obj_or_filepath: str or h5 obj
@@ -84,25 +226,65 @@ class Container(dict):
         :type f: ml_framework, optional
         :param slice_obj: slice object to slice all h5 elements.
         :type slice_obj: slice or sequence of slices
+        :param out: Container of preallocated numpy arrays, with the same structure and sliced shapes as the h5 file,
+                    to read the datasets directly into. Useful for reusing buffers when repeatedly loading batches.
+        :type out: Container of numpy arrays, optional
+        :param lazy: Whether to return a LazyContainer, which only reads the datasets and rows which are accessed.
+        :type lazy: bool, optional
+        :param cache_size: Maximum number of bytes of recently read chunks to cache, if lazy. Default is 64MB.
+        :type cache_size: int, optional
         :return: Container loaded from disk
         """
+        if lazy:
+            return LazyContainer(h5_obj_or_filepath, f, cache_size).slice(slice_obj)
         container_dict = dict()
         if type(h5_obj_or_filepath) is str:
-            h5_obj = _h5py.File(h5_obj_or_filepath, 'r')
+            h5_obj = _ivy_cont_io._h5py.File(h5_obj_or_filepath, 'r')
         else:
             h5_obj = h5_obj_or_filepath
+        is_numpy = f is _np or getattr(f, '__name__', None) == 'ivy.numpy'
 
-        for key, value in sorted(h5_obj.items()):
-            if isinstance(value, _h5py.Group):
-                container_dict[key] = Container.from_disk(value, f, slice_obj)
-            elif isinstance(value, _h5py.Dataset):
-                if f is _np:
-                    container_dict[key] = value[slice_obj]
+        try:
+            for key, value in sorted(h5_obj.items()):
+                out_value = None if out is None else out[key]
+                if isinstance(value, _ivy_cont_io._h5py.Group):
+                    container_dict[key] = Container.from_disk(value, f, slice_obj, out_value)
+                elif isinstance(value, _ivy_cont_io._h5py.Dataset):
+                    np_value = _ivy_cont_io._read_h5_dataset(value, slice_obj, out_value)
+                    container_dict[key] = np_value if is_numpy else _ivy_gen.array(np_value, f=f)
                 else:
-                    container_dict[key] = _ivy_gen.array(list(value[slice_obj]), f=f)
-            else:
-                raise Exception('Item found inside h5_obj which was neither a Group nor a Dataset.')
-        return Container(container_dict)
+                    raise Exception('Item found inside h5_obj which was neither a Group nor a Dataset.')
+        finally:
+            if h5_obj is not h5_obj_or_filepath:
+                h5_obj.close()
+        return Container._from_sorted(container_dict)
+
+    @staticmethod
+    def batches_from_disk(h5_obj_or_filepath, f, batch_size, shuffle=False, seed_value=None, drop_last=False,
+                          num_prefetch=2):
+        """
+        Iterate over batches of the container saved to disk, as an h5py file, at the specified filepath.
+        The file is kept open, and the next batches are read and converted to framework arrays in a background thread
+        while the current batch is consumed.
+
+        :param h5_obj_or_filepath: Filepath where the container object is saved to disk, or h5 object.
+        :type h5_obj_or_filepath: str or h5 obj
+        :param f: Machine learning framework.
+        :type f: ml_framework
+        :param batch_size: Number of entries along axis 0 in each batch.
+        :type batch_size: int
+        :param shuffle: Whether to iterate over the entries in a random order. Default is False.
+        :type shuffle: bool, optional
+        :param seed_value: random seed to use for the shuffled order.
+        :type seed_value: int, optional
+        :param drop_last: Whether to drop the final batch, if it is smaller than batch_size. Default is False.
+        :type drop_last: bool, optional
+        :param num_prefetch: Maximum number of batches to read ahead. Default is 2.
+        :type num_prefetch: int, optional
+        :return: Iterator of batch containers, which can also be used as a context manager to close the file early.
+        """
+        return _ivy_cont_io._PrefetchingBatchIterator(h5_obj_or_filepath, f, batch_size, shuffle, seed_value,
+                                                      drop_last, num_prefetch)
 
     @staticmethod
     def h5_file_size(h5_obj_or_filepath):
@@ -113,56 +295,170 @@ class Container(dict):
         :type h5_obj_or_filepath: str or h5 obj
         :return: Size of h5 file contents, and batch size.
         """
+        metadata = Container.h5_metadata(h5_obj_or_filepath)
+        return metadata.size, metadata.batch_size
+
+    @staticmethod
+    def h5_metadata(h5_obj_or_filepath):
+        """
+        Get metadata index of the groups and datasets of an h5 file, with the key chain, shape, dtype, number of bytes,
+        batch size and chunk layout of every dataset. The index of a file, given by filepath or as an h5 file opened in
+        read mode, is cached until the modification time or size of the file changes.
+
+        :param h5_obj_or_filepath: Filepath where the container object is saved to disk, or h5 object.
+        :type h5_obj_or_filepath: str or h5 obj
+        :return: H5Metadata index of the file.
+        """
         if type(h5_obj_or_filepath) is str:
-            h5_obj = _h5py.File(h5_obj_or_filepath, 'r')
+            filepath = h5_obj_or_filepath
+        elif isinstance(h5_obj_or_filepath, _ivy_cont_io._h5py.File) and h5_obj_or_filepath.mode == 'r':
+            filepath = h5_obj_or_filepath.filename
         else:
-            h5_obj = h5_obj_or_filepath
-
-        size = 0
-        batch_size = 0
-        for key, value in sorted(h5_obj.items()):
-            if isinstance(value, _h5py.Group):
-                size_to_add, batch_size = Container.h5_file_size(value)
-                size += size_to_add
-            elif isinstance(value, _h5py.Dataset):
-                value_shape = value.shape
-                size += _reduce(_mul, value_shape, 1) * value.dtype.itemsize
-                batch_size = value_shape[0]
-            else:
-                raise Exception('Item found inside h5_obj which was neither a Group nor a Dataset.')
-        return size, batch_size
+            return _ivy_cont_io.H5Metadata(h5_obj_or_filepath)
+        filepath = _os.path.abspath(filepath)
+        stat = _os.stat(filepath)
+        cached = _ivy_cont_io._h5_metadata_cache.get(filepath)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        if type(h5_obj_or_filepath) is str:
+            with _ivy_cont_io._h5py.File(filepath, 'r') as h5_obj:
+                metadata = _ivy_cont_io.H5Metadata(h5_obj)
+        else:
+            metadata = _ivy_cont_io.H5Metadata(h5_obj_or_filepath)
+        _ivy_cont_io._h5_metadata_cache[filepath] = (stat.st_mtime_ns, stat.st_size, metadata)
+        return metadata
 
     @staticmethod
-    def shuffle_h5_file(h5_obj_or_filepath, seed_value=0):
+    def shuffle_h5_file(h5_obj_or_filepath, seed_value=0, memory_budget=int(2**28), tmp_dir=None):
         """
         Shuffle entries in all datasets of h5 file, such that they are still aligned along axis 0.
+        One permutation is generated, the same as for Container.shuffle with the same seed, and applied to each dataset
+        in contiguous blocks of rows. Datasets which do not fit in the memory budget are shuffled out-of-core, via a
+        temporary file.
 
         :param h5_obj_or_filepath: Filepath where the container object is saved to disk, or h5 object.
         :type h5_obj_or_filepath: str or h5 obj
         :param seed_value: random seed to use for array shuffling
         :type seed_value: int
+        :param memory_budget: Maximum number of bytes of dataset rows held in memory at once, excluding the index
+                              arrays of the permutation. Default is 256MB.
+        :type memory_budget: int, optional
+        :param tmp_dir: Directory for the temporary file used for out-of-core shuffling. Default is the system default.
+        :type tmp_dir: str, optional
+        :return: Throughput, in dataset rows shuffled per second.
         """
         if seed_value is None:
             seed_value = _random.randint(0, 1000)
         if type(h5_obj_or_filepath) is str:
-            h5_obj = _h5py.File(h5_obj_or_filepath, 'a')
+            h5_obj = _ivy_cont_io._h5py.File(h5_obj_or_filepath, 'a')
         else:
             h5_obj = h5_obj_or_filepath
 
-        for key, value in sorted(h5_obj.items()):
-            if isinstance(value, _h5py.Group):
-                Container.shuffle_h5_file(value, seed_value)
-            elif isinstance(value, _h5py.Dataset):
-                _random.seed(seed_value)
-                _random.shuffle(value)
-            else:
-                raise Exception('Item found inside h5_obj which was neither a Group nor a Dataset.')
-        if isinstance(h5_obj, _h5py.File):
-            h5_obj.close()
+        start_time = _time.perf_counter()
+        try:
+            num_rows = _ivy_cont_io._shuffle_h5_group(h5_obj, seed_value, dict(), memory_budget, tmp_dir)
+        finally:
+            if h5_obj is not h5_obj_or_filepath:
+                h5_obj.close()
+        return num_rows / max(_time.perf_counter() - start_time, 1e-9)
+
+    @staticmethod
+    def load(filepath, f=None, mmap=True):
+        """
+        Load container object from a file written by Container.save, in either the raw or the npz format.
+        For the raw format, the file is memory mapped if mmap is True, so that no data is read until it is accessed.
+
+        :param filepath: Filepath where the container object is saved.
+        :type filepath: str
+        :param f: Machine learning framework for the loaded arrays. Default is numpy arrays, which are read-only views
+                  into the memory map if mmap is True.
+        :type f: ml_framework, optional
+        :param mmap: Whether to memory map raw files, rather than reading them into memory. Default is True.
+        :type mmap: bool, optional
+        :return: Container loaded from disk.
+        """
+        with open(filepath, 'rb') as file:
+            is_raw = file.read(len(_ivy_cont_io._RAW_MAGIC)) == _ivy_cont_io._RAW_MAGIC
+        if is_raw:
+            leaves = _ivy_cont_io._load_raw(filepath, mmap)
+        else:
+            with _np.load(filepath) as npz_file:
+                leaves = [(key_chain, npz_file[key_chain]) for key_chain in npz_file.files]
+        if f is not None and f is not _np and f.__name__ != 'ivy.numpy':
+            leaves = [(key_chain, _ivy_gen.array(value, f=f)) for key_chain, value in leaves]
+        return Container._from_flat_entries(sorted([(tuple(key_chain.split('/')), value)
+                                                    for key_chain, value in leaves]))
 
     # Private Methods #
     # ----------------#
 
+    @staticmethod
+    def _from_sorted(dict_in):
+        """
+        Fast internal constructor, for dicts whose keys are already sorted and whose sub-dicts are already containers.
+        """
+        container = Container.__new__(Container)
+        dict.update(container, dict_in)
+        container._size = container._get_size()
+        return container
+
+    def _build_flat_index(self):
+        # leaf entries are (tuple of keys, value) in sorted order, with empty sub-containers kept as entries so that
+        # the structure can be rebuilt, and the lookup dict maps the key chains of all leaves and sub-containers to
+        # values, for string keys. Each sub-container is linked to its parent before its items are read, so that any
+        # later mutation of it invalidates this index
+        entries = list()
+        lookup = dict()
+
+        def _add(container, keys, prefix):
+            items = sorted(container.items())
+            if keys and not items:
+                entries.append((keys, container))
+            for key, value in items:
+                key_chain = prefix + key if prefix is not None and isinstance(key, str) else None
+                if key_chain is not None:
+                    lookup[key_chain] = value
+                if isinstance(value, Container):
+                    value._link_parent(container)
+                    _add(value, keys + (key,), None if key_chain is None else key_chain + '/')
+                else:
+                    entries.append((keys + (key,), value))
+
+        _add(self, (), '')
+        return entries, lookup
+
+    def _flat_index(self):
+        # the version is read before building, so that an index built during a mutation is never current afterwards
+        version = self._version
+        flat = self._flat
+        if flat is None or flat[0] != version:
+            flat = self._flat = (version,) + self._build_flat_index()
+        return flat[1], flat[2]
+
+    @staticmethod
+    def _from_flat_entries(entries):
+        return _unflatten_from_leaves(entries)
+
+    def _link_parent(self, parent):
+        # weak link to a container holding this one, so that mutations of this container invalidate its indices
+        parents = self.__dict__.get('_parents')
+        if parents is None:
+            parents = self.__dict__.setdefault('_parents', dict())
+        parent_ref = parents.get(id(parent))
+        if parent_ref is None or parent_ref() is not parent:
+            parents[id(parent)] = _weakref.ref(parent)
+
+    def _mutated(self):
+        self._version += 1
+        parents = self.__dict__.get('_parents')
+        if parents:
+            for parent_id, parent_ref in list(parents.items()):
+                parent = parent_ref()
+                if parent is None:
+                    parents.pop(parent_id, None)
+                else:
+                    parent._mutated()
+
     def _get_size(self):
         vals = list(self.values())
         if not vals:
@@ -179,26 +475,52 @@ class Container(dict):
     # Public Methods #
     # ---------------#
 
-    def shuffle(self, seed_value=None, f=None):
+    def shuffle(self, seed_value=None, f=None, in_place=False):
         """
         Shuffle entries in all sub-arrays, such that they are still aligned along axis 0.
+        One permutation is generated, without seeding any global random state, and applied to each sub-array by
+        indexing along axis 0, natively for numpy, jax, torch and tensorflow and with a gather for other frameworks,
+        with the indices created once per framework and device.
 
         :param seed_value: random seed to use for array shuffling
         :type seed_value: int
         :param f: Machine learning framework. Inferred from inputs if None.
         :type f: ml_framework, optional
+        :param in_place: Whether to shuffle numpy sub-arrays in place. Default is False.
+        :type in_place: bool, optional
+        :return: Container with all sub-arrays shuffled.
         """
-        return_dict = dict()
         if seed_value is None:
             seed_value = _random.randint(0, 1000)
-        for key, value in sorted(self.items()):
-            if isinstance(value, Container):
-                return_dict[key] = value.shuffle(seed_value)
-            else:
-                f = _get_framework(value, f=f)
-                _ivy_rand.seed(seed_value, f=f)
-                return_dict[key] = _ivy_rand.shuffle(value, f)
-        return Container(return_dict)
+        # axis 0 size -> permutation, and (framework, device, axis 0 size) -> framework indices
+        perms = dict()
+        indices = dict()
+
+        def _shuffle(value, _=''):
+            num_rows = value.shape[0]
+            if num_rows not in perms:
+                perms[num_rows] = _np.random.RandomState(seed_value).permutation(num_rows)
+            perm = perms[num_rows]
+            if isinstance(value, _np.ndarray):
+                if in_place:
+                    value[...] = value[perm]
+                    return value
+                return value[perm]
+            framework = _get_framework(value, f=f)
+            framework_name = getattr(framework, '__name__', None)
+            dev = _ivy_gen.get_device(value, f=framework)
+            if (framework, dev, num_rows) not in indices:
+                indices[(framework, dev, num_rows)] = _ivy_gen.array(
+                    perm if framework_name in _NATIVE_TAKE_FRAMEWORKS else perm[:, None], 'int64', dev, f=framework)
+            perm_indices = indices[(framework, dev, num_rows)]
+            if framework_name in ['ivy.jax', 'ivy.torch']:
+                return value[perm_indices]
+            elif framework_name == 'ivy.tensorflow':
+                import tensorflow as tf
+                return tf.gather(value, perm_indices)
+            return _ivy_gen.gather_nd(value, perm_indices, f=framework)
+
+        return self.map(_shuffle)
 
     def slice(self, slice_obj):
         """
@@ -219,7 +541,7 @@ class Container(dict):
                 except:
                     return_dict[key] = value
 
-        return Container(return_dict)
+        return Container._from_sorted(return_dict)
 
     def expand_dims(self, axis):
         """
@@ -235,11 +557,12 @@ class Container(dict):
                 return_dict[key] = value.expand_dims(axis)
             else:
                 return_dict[key] = _ivy_gen.expand_dims(value, axis)
-        return Container(return_dict)
+        return Container._from_sorted(return_dict)
 
     def unstack(self, dim, dim_size):
         """
-        Unstack containers along specified dimension.
+        Unstack containers along specified dimension. Each sub-array is split once, and the splits are zipped into
+        containers with the same tree structure, without traversing the container once per slice.
 
         :param dim: Dimensions along which to unstack.
         :type dim: int
@@ -247,9 +570,45 @@ class Container(dict):
         :type dim_size: int
         :return: List of containers, unstacked along the specified dimension.
         """
-        return [self.slice(tuple([slice(None, None, None)] * dim + [slice(i, i + 1, 1)])) for i in range(dim_size)]
+        leaves, treedef = self.flatten()
+        split_leaves = list()
+        for leaf in leaves:
+            # noinspection PyBroadException
+            try:
+                if leaf.shape[dim] != dim_size:
+                    splits = None
+                elif isinstance(leaf, _np.ndarray):
+                    # iterating over the moved axis yields the same views as np.split, without a python level split
+                    axis = dim % leaf.ndim
+                    splits = list(_np.expand_dims(_np.moveaxis(leaf, axis, 0), axis + 1))
+                else:
+                    splits = _ivy_gen.split(leaf, dim_size, dim)
+            except Exception:
+                splits = None
+            if splits is None:
+                splits = [_slice_leaf(leaf, dim, i) for i in range(dim_size)]
+            split_leaves.append(splits)
+        if not leaves:
+            return [Container.unflatten(treedef, []) for _ in range(dim_size)]
+        return [Container.unflatten(treedef, slice_leaves) for slice_leaves in zip(*split_leaves)]
+
+    def unstack_iterator(self, dim, dim_size):
+        """
+        Return iterator which lazily yields the containers unstacked along the specified dimension, one at a time.
+        Useful for very large dimension sizes, where only one slice is needed at once.
+
+        :param dim: Dimensions along which to unstack.
+        :type dim: int
+        :param dim_size: Size of the dimension to unstack.
+        :type dim_size: int
+        :return: Iterator of containers, unstacked along the specified dimension.
+        """
+        leaves, treedef = self.flatten()
+        for i in range(dim_size):
+            yield Container.unflatten(treedef, [_slice_leaf(leaf, dim, i) for leaf in leaves])
 
-    def to_disk(self, h5_obj_or_filepath, starting_index=0, mode='a', max_batch_size=None):
+    def to_disk(self, h5_obj_or_filepath, starting_index=0, mode='a', max_batch_size=None, chunks=True,
+                compression=None, compression_opts=None, incremental=False):
         """
         Save container object to disk, as an h5py file, at the specified filepath.
 
@@ -261,32 +620,82 @@ class Container(dict):
         :type mode: str
         :param max_batch_size: Maximum batch size for the container on disk, this is useful if later appending to file.
         :type max_batch_size: int
-        :type h5_obj_or_filepath: str or h5 object
+        :param chunks: Chunk shape of new datasets, or number of entries along axis 0 per chunk, with the remaining
+                       dimensions unchunked. Default is True, for the h5py automatic chunk shape.
+        :type chunks: bool or int or sequence of ints, optional
+        :param compression: Compression filter of new datasets, ['gzip', 'lzf', None]. Default is None.
+        :type compression: str, optional
+        :param compression_opts: Compression level for gzip, between 0 and 9.
+        :type compression_opts: int, optional
+        :param incremental: Whether to only write the entries which changed since they were last saved incrementally
+                            at the same starting index. A hash of each written entry is stored in the dataset
+                            attributes, and compared against before writing. Useful for frequent checkpoints where
+                            most entries are frozen. Default is False.
+        :type incremental: bool, optional
         """
         if type(h5_obj_or_filepath) is str:
-            h5_obj = _h5py.File(h5_obj_or_filepath, mode)
+            h5_obj = _ivy_cont_io._h5py.File(h5_obj_or_filepath, mode)
         else:
             h5_obj = h5_obj_or_filepath
-        for key, value in sorted(self.items()):
-            if isinstance(value, Container):
-                if key not in h5_obj.keys():
-                    h5_group = h5_obj.create_group(key)
+        try:
+            for key, value in sorted(self.items()):
+                if isinstance(value, Container):
+                    value.to_disk(h5_obj.require_group(key), starting_index, mode, max_batch_size, chunks, compression,
+                                  compression_opts, incremental)
                 else:
-                    h5_group = h5_obj[key]
-                value.to_disk(h5_group, starting_index, mode, max_batch_size)
-            else:
-                value_as_np = _ivy_gen.to_numpy(value)
-                value_shape = value_as_np.shape
-                this_batch_size = value_shape[0]
-                if not max_batch_size:
-                    max_batch_size = starting_index + this_batch_size
-                if key not in h5_obj.keys():
-                    dataset_shape = [max_batch_size] + list(value_shape[1:])
-                    maxshape = ([None for _ in dataset_shape])
-                    h5_obj.create_dataset(key, dataset_shape, dtype=value_as_np.dtype, maxshape=maxshape)
-                space_left = max_batch_size - starting_index
-                amount_to_write = min(this_batch_size, space_left)
-                h5_obj[key][starting_index:starting_index + amount_to_write] = value_as_np[0:amount_to_write]
+                    value_as_np = value if isinstance(value, _np.ndarray) else _ivy_gen.to_numpy(value)
+                    value_shape = value_as_np.shape
+                    this_batch_size = value_shape[0]
+                    if not max_batch_size:
+                        max_batch_size = starting_index + this_batch_size
+                    if key in h5_obj:
+                        dataset = h5_obj[key]
+                        if not incremental:
+                            _ivy_cont_io._invalidate_h5_hash(dataset)
+                    else:
+                        dataset = _ivy_cont_io._create_h5_dataset(
+                            h5_obj, key, [max_batch_size] + list(value_shape[1:]), value_as_np.dtype, chunks,
+                            compression, compression_opts)
+                    space_left = max_batch_size - starting_index
+                    amount_to_write = min(this_batch_size, space_left)
+                    value_to_write = value_as_np[0:amount_to_write]
+                    if not incremental:
+                        _ivy_cont_io._write_h5_dataset(dataset, starting_index, value_to_write)
+                        continue
+                    value_hash = _ivy_cont_io._h5_hash(starting_index, value_to_write)
+                    if dataset.attrs.get(_ivy_cont_io._H5_HASH_ATTR) != value_hash:
+                        _ivy_cont_io._write_h5_dataset(dataset, starting_index, value_to_write)
+                        dataset.attrs[_ivy_cont_io._H5_HASH_ATTR] = value_hash
+        finally:
+            if h5_obj is not h5_obj_or_filepath:
+                h5_obj.close()
+
+    def save(self, filepath, format='raw'):
+        """
+        Save container object to a single file, either in the raw format, with a header of the key chains, data types,
+        shapes and offsets followed by one binary blob of 64 byte aligned arrays, which can be memory mapped when
+        loading, or in the numpy npz format, for interoperability.
+
+        :param filepath: Filepath for where to save the container.
+        :type filepath: str
+        :param format: File format, ['raw', 'npz']. Default is 'raw'.
+        :type format: str, optional
+        """
+        leaves = list()
+        for key_chain, value in _ivy_cont_io._flatten_to_leaves(self):
+            value_as_np = value if isinstance(value, _np.ndarray) else (
+                _ivy_gen.to_numpy(value) if hasattr(value, 'shape') else _np.asarray(value))
+            if value_as_np.dtype.hasobject:
+                raise Exception('Container entry {} cannot be saved, as it is not an array.'.format(
+                    '/'.join(key_chain)))
+            leaves.append(('/'.join(key_chain), value_as_np))
+        if format == 'raw':
+            _ivy_cont_io._save_raw(filepath, leaves)
+        elif format == 'npz':
+            with open(filepath, 'wb') as file:
+                _np.savez(file, **dict(leaves))
+        else:
+            raise Exception('Invalid format {}, must be one of raw or npz.'.format(format))
 
     def to_list(self):
         """
@@ -316,18 +725,29 @@ class Container(dict):
                 return_dict[key] = value
         return return_dict
 
+    def flatten(self):
+        """
+        Flatten the container into its leaves and its tree structure, which is cached until the container or any of
+        its sub-containers is mutated.
+
+        :return: List of leaves in sorted key chain order, and hashable tree structure for Container.unflatten.
+        """
+        version = self._version
+        tree = self._tree
+        if tree is None or tree[0] != version:
+            leaves = list()
+            tree = self._tree = (version, leaves, _TreeDef(_tree_nodes(self, leaves)))
+        return list(tree[1]), tree[2]
+
     def to_iterator(self):
         """
         Return iterator for traversing through the nested elements of container object.
 
         :return: Iterator for the container elements.
         """
-        for key, value in sorted(self.items()):
-            if isinstance(value, Container):
-                # noinspection PyCompatibility
-                yield from value.to_iterator()
-            else:
-                yield key, value
+        for keys, value in self._flat_index()[0]:
+            if not isinstance(value, Container):
+                yield keys[-1], value
 
     def to_flat_list(self):
         """
@@ -335,7 +755,7 @@ class Container(dict):
 
         :return: Container as flat list.
         """
-        return list([item for key, item in self.to_iterator()])
+        return [value for _, value in self._flat_index()[0] if not isinstance(value, Container)]
 
     def to_random(self, f):
         """
@@ -393,7 +813,7 @@ class Container(dict):
             else:
                 out_dict[key] = value
         if len(out_dict):
-            return Container(out_dict)
+            return Container._from_sorted(out_dict)
         return
 
     def copy(self):
@@ -402,9 +822,15 @@ class Container(dict):
 
         :return: A copy of the container
         """
-        return Container(self.to_dict())
+        return_dict = dict()
+        for key, value in sorted(self.items()):
+            if isinstance(value, Container):
+                return_dict[key] = value.copy()
+            elif value is not None and key != '_f':
+                return_dict[key] = value
+        return Container._from_sorted(return_dict)
 
-    def map(self, func, key_chain=''):
+    def map(self, func, key_chain='', parallel=False, max_workers=None, processes=False):
         """
         Apply function to all array values of container
 
@@ -412,15 +838,37 @@ class Container(dict):
         :type func: python function
         :param key_chain: Chain of keys for this dict entry
         :type key_chain: str
+        :param parallel: Whether to apply the function to the entries concurrently, in a shared pool of worker threads,
+                         which is useful for functions which release the GIL. The function is called with the
+                         framework stack of the caller, such as the framework set with ivy.numpy.use, and the results
+                         are in the same key chain order as for sequential mapping. Default is False.
+        :type parallel: bool, optional
+        :param max_workers: Number of workers. Default is None, for the shared pool of min(32, number of processors + 4)
+                            threads or of one process per processor. Other values use a pool of that size for this
+                            call only, which is shut down before returning.
+        :type max_workers: int, optional
+        :param processes: Whether the shared pool uses worker processes rather than threads, for functions which hold
+                          the GIL. The function and the entries must then be picklable. Default is False.
+        :type processes: bool, optional
         """
-        return_dict = dict()
-        for key, value in sorted(self.items()):
-            this_key_chain = key_chain + '/' + key
-            if isinstance(value, Container):
-                return_dict[key] = value.map(func, this_key_chain)
-            else:
-                return_dict[key] = func(value, this_key_chain)
-        return Container(return_dict)
+        # empty sub-containers are entries of the flat index, and are mapped to new empty containers
+        entries = self._flat_index()[0]
+        if not parallel or getattr(_map_worker_local, 'is_worker', False):
+            # nested parallel maps run sequentially, as waiting on the shared pool from inside it could deadlock
+            return self._from_flat_entries(
+                [(keys, Container() if isinstance(value, Container) else func(value, _join_key_chain(key_chain, keys)))
+                 for keys, value in entries])
+        leaf_entries = [(keys, value) for keys, value in entries if not isinstance(value, Container)]
+        values = [value for _, value in leaf_entries]
+        key_chains = [_join_key_chain(key_chain, keys) for keys, _ in leaf_entries]
+        if max_workers is None:
+            results = iter(_map_leaves(_map_executor(processes), processes, func, values, key_chains,
+                                       _os.cpu_count() or 1))
+        else:
+            with _new_map_executor(processes, max_workers) as executor:
+                results = iter(_map_leaves(executor, processes, func, values, key_chains, max_workers))
+        return self._from_flat_entries([(keys, Container() if isinstance(value, Container) else next(results))
+                                        for keys, value in entries])
 
     def dtype(self):
         """
@@ -445,6 +893,35 @@ class Container(dict):
                 return x
         return self.map(to_list)
 
+    def pack(self, f=None):
+        """
+        Pack all array entries into one contiguous flat buffer per data type, with the entries returned as views into
+        the buffers where the framework supports it. Transfers, serialization and elementwise updates can then be
+        applied to the few buffers in bulk, rather than to every entry.
+
+        :param f: Machine learning framework. Inferred from inputs if None.
+        :type f: ml_framework, optional
+        :return: PackedContainer with the same structure and values.
+        """
+        leaves, treedef = self.flatten()
+        flat_leaves = dict()
+        sizes = dict()
+        index = list()
+        for leaf in leaves:
+            if not hasattr(leaf, 'shape') or not hasattr(leaf, 'dtype'):
+                index.append((None, None, leaf))
+                continue
+            framework = _get_framework(leaf, f=f)
+            dtype_str = _dtype_str(_ivy_gen.dtype(leaf, f=framework))
+            shape = tuple(leaf.shape)
+            offset = sizes.get(dtype_str, 0)
+            flat_leaves.setdefault(dtype_str, list()).append(_ivy_gen.reshape(leaf, (-1,), f=framework))
+            sizes[dtype_str] = offset + _reduce(_mul, shape, 1)
+            index.append((dtype_str, offset, shape))
+        buffers = {dtype_str: _ivy_gen.concatenate(dtype_leaves, 0, f=f) for dtype_str, dtype_leaves in
+                   flat_leaves.items()}
+        return PackedContainer(buffers, (treedef, index), f)
+
     # Built-ins #
     # ----------#
 
@@ -455,9 +932,318 @@ class Container(dict):
             # noinspection PyUnresolvedReferences
             return super.__getattr__(item)
 
+    def __getitem__(self, key):
+        """
+        Get an entry, either by key, or by key chain such as 'a/b/c', which is looked up in the cached flat index.
+        """
+        try:
+            return dict.__getitem__(self, key)
+        except KeyError:
+            if isinstance(key, str) and '/' in key:
+                try:
+                    return self._flat_index()[1][key]
+                except KeyError:
+                    pass
+            raise
+
+    def __getstate__(self):
+        # the cached indices and the weak links to parent containers are rebuilt on demand, rather than copied
+        return {key: value for key, value in self.__dict__.items()
+                if key not in ['_version', '_flat', '_tree', '_parents']}
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._mutated()
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._mutated()
+
+    def clear(self):
+        dict.clear(self)
+        self._mutated()
+
+    def pop(self, *args):
+        value = dict.pop(self, *args)
+        self._mutated()
+        return value
+
+    def popitem(self):
+        value = dict.popitem(self)
+        self._mutated()
+        return value
+
+    def setdefault(self, key, default=None):
+        value = dict.setdefault(self, key, default)
+        self._mutated()
+        return value
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._mutated()
+
     # Getters #
     # --------#
 
     @property
     def size(self):
         return self._size
+
+
+# noinspection PyMissingConstructor
+class LazyContainer(Container):
+
+    def __init__(self, h5_obj_or_filepath, f, cache_size=int(2**26)):
+        """
+        Initialize lazy container view of an h5 file. Only the datasets and rows which are accessed are read from
+        disk, either through memory maps for contiguous uncompressed datasets, or in chunks of rows through a shared
+        least-recently-used chunk cache. Slicing returns a new lazy view, and accessing a dataset entry, directly or
+        through a key chain such as 'a/b/c', reads the rows of the view and returns them as an array of framework f.
+
+        :param h5_obj_or_filepath: Filepath where the container object is saved to disk, or h5 object.
+        :type h5_obj_or_filepath: str or h5 obj
+        :param f: Machine learning framework.
+        :type f: ml_framework
+        :param cache_size: Maximum number of bytes of recently read chunks to cache. Default is 64MB.
+        :type cache_size: int, optional
+        """
+        if type(h5_obj_or_filepath) is str:
+            h5_obj = _ivy_cont_io._h5py.File(h5_obj_or_filepath, 'r')
+            # shared with all sub-containers and views, so that the file can be closed from any of them
+            self._h5_file = [h5_obj]
+        else:
+            h5_obj = h5_obj_or_filepath
+            self._h5_file = [None]
+        self._init_from_h5(h5_obj, f, _ivy_cont_io._ChunkCache(cache_size))
+
+    def _init_from_h5(self, h5_obj, f, cache):
+        # the structure is built from the metadata index, and each dataset is only opened once it is read
+        metadata = Container.h5_metadata(h5_obj)
+        tree = dict()
+        for key_chain in metadata.groups:
+            sub_tree = tree
+            for key in key_chain.split('/'):
+                sub_tree = sub_tree.setdefault(key, dict())
+        for key_chain, dataset_metadata in metadata.datasets.items():
+            keys = key_chain.split('/')
+            sub_tree = tree
+            for key in keys[:-1]:
+                sub_tree = sub_tree.setdefault(key, dict())
+            sub_tree[keys[-1]] = _ivy_cont_io._LazyDataset(h5_obj, key_chain, dataset_metadata, metadata.filename,
+                                                           cache)
+        self._init_from_tree(tree, f)
+
+    def _init_from_tree(self, tree, f):
+        self._f = f
+        self._row_slices = ()
+        self._trailing_slices = ()
+        for key, value in sorted(tree.items()):
+            if isinstance(value, dict):
+                child = LazyContainer.__new__(LazyContainer)
+                child._h5_file = self._h5_file
+                child._init_from_tree(value, f)
+                value = child
+            dict.__setitem__(self, key, value)
+        self._size = self._get_size()
+
+    def _view(self, row_slices, trailing_slices):
+        view = LazyContainer.__new__(LazyContainer)
+        view._h5_file = self._h5_file
+        view._f = self._f
+        view._row_slices = row_slices
+        view._trailing_slices = trailing_slices
+        for key, value in dict.items(self):
+            if isinstance(value, LazyContainer):
+                value = value._view(row_slices, trailing_slices)
+            dict.__setitem__(view, key, value)
+        view._size = view._get_size()
+        return view
+
+    def _flat_index(self):
+        # not cached, as the entries are read from disk on access
+        return self._build_flat_index()
+
+    def _get_size(self):
+        for key in sorted(self.keys()):
+            value = dict.__getitem__(self, key)
+            if isinstance(value, LazyContainer):
+                return value._get_size()
+            if not value.shape:
+                return 0
+            return len(value.rows(self._row_slices))
+        return 0
+
+    # Public Methods #
+    # ---------------#
+
+    def slice(self, slice_obj):
+        """
+        Get lazy view of a slice of the container object. No data is read.
+
+        :param slice_obj: slice object to slice all container elements.
+        :type slice_obj: slice or sequence of slices
+        :return: LazyContainer view at desired slice, or Container if the slice cannot be composed lazily.
+        """
+        if isinstance(slice_obj, slice):
+            row_slice, trailing_slices = slice_obj, ()
+        else:
+            row_slice, trailing_slices = slice_obj[0], tuple(slice_obj[1:])
+        if not isinstance(row_slice, slice) or (trailing_slices and self._trailing_slices):
+            return Container(self).slice(slice_obj)
+        return self._view(self._row_slices + (row_slice,), trailing_slices or self._trailing_slices)
+
+    def unstack(self, dim, dim_size):
+        """
+        Unstack containers along specified dimension, as lazy views. No data is read.
+
+        :param dim: Dimensions along which to unstack.
+        :type dim: int
+        :param dim_size: Size of the dimension to unstack.
+        :type dim_size: int
+        :return: List of containers, unstacked along the specified dimension.
+        """
+        return list(self.unstack_iterator(dim, dim_size))
+
+    def unstack_iterator(self, dim, dim_size):
+        """
+        Return iterator which yields the containers unstacked along the specified dimension, as lazy views.
+
+        :param dim: Dimensions along which to unstack.
+        :type dim: int
+        :param dim_size: Size of the dimension to unstack.
+        :type dim_size: int
+        :return: Iterator of containers, unstacked along the specified dimension.
+        """
+        for i in range(dim_size):
+            yield self.slice(tuple([slice(None, None, None)] * dim + [slice(i, i + 1, 1)]))
+
+    def close(self):
+        """
+        Close the h5 file, if it was opened by this container, or by the container this is a view or sub-container of.
+        """
+        if self._h5_file[0] is not None:
+            self._h5_file[0].close()
+            self._h5_file[0] = None
+
+    # Built-ins #
+    # ----------#
+
+    def __getitem__(self, key):
+        if isinstance(key, str) and '/' in key:
+            key, remaining_key_chain = key.split('/', 1)
+            return self[key][remaining_key_chain]
+        value = dict.__getitem__(self, key)
+        if not isinstance(value, _ivy_cont_io._LazyDataset):
+            return value
+        np_value = value.read(self._row_slices, self._trailing_slices)
+        if self._f is _np or getattr(self._f, '__name__', None) == 'ivy.numpy':
+            return np_value
+        return _ivy_gen.array(np_value, f=self._f)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+
+def _dtype_str(dtype):
+    # framework independent name of a data type, such as 'float32'
+    if isinstance(getattr(dtype, 'name', None), str):
+        return dtype.name
+    try:
+        return _np.dtype(dtype).name
+    except TypeError:
+        return str(dtype).split('.')[-1]
+
+
+class PackedContainer(Container):
+
+    def __init__(self, buffers, index, f=None):
+        """
+        Initialize container whose array entries are views into one contiguous flat buffer per data type, as returned
+        by Container.pack. The buffers and index can be transferred or serialized, and the container recreated from
+        them. Entries set or removed after packing are not reflected in the buffers.
+
+        :param buffers: Dict of data type string to flat buffer of all entries of that data type.
+        :type buffers: dict of str to array
+        :param index: Tree structure and (data type string, offset, shape) of each entry, as returned by
+                      PackedContainer.index.
+        :type index: tuple
+        :param f: Machine learning framework. Inferred from inputs if None.
+        :type f: ml_framework, optional
+        """
+        self._buffers = buffers
+        self._index = index
+        self._f = f
+        treedef, entries = index
+        frameworks = {dtype_str: _get_framework(buffer, f=f) for dtype_str, buffer in buffers.items()}
+        leaves = list()
+        for dtype_str, offset, shape in entries:
+            if dtype_str is None:
+                leaves.append(shape)
+                continue
+            leaves.append(_ivy_gen.reshape(buffers[dtype_str][offset:offset + _reduce(_mul, shape, 1)], shape,
+                                           f=frameworks[dtype_str]))
+        for key, value in Container.unflatten(treedef, leaves).items():
+            dict.__setitem__(self, key, value)
+        self._size = self._get_size()
+
+    # Public Methods #
+    # ---------------#
+
+    @property
+    def buffers(self):
+        """
+        Dict of data type string to the flat buffer holding all entries of that data type.
+        """
+        return self._buffers
+
+    @property
+    def index(self):
+        """
+        Tree structure and (data type string, offset, shape) of each entry, for recreating the container from the
+        buffers.
+        """
+        return self._index
+
+    def map_buffers(self, func):
+        """
+        Apply function to each buffer, such as a device transfer or an elementwise update, and return the container
+        of the new buffers. The function must preserve the size and data type of each buffer.
+
+        :param func: Function to apply to each buffer, with the buffer and its data type string as arguments.
+        :type func: python function
+        :return: New PackedContainer with the function applied to every buffer.
+        """
+        return PackedContainer({dtype_str: func(buffer, dtype_str) for dtype_str, buffer in self._buffers.items()},
+                               self._index, self._f)
+
+    def unpack(self):
+        """
+        Return a regular container with the same structure and values. The entries remain views into the buffers
+        where the framework supports it.
+
+        :return: Unpacked container.
+        """
+        leaves, treedef = self.flatten()
+        return Container.unflatten(treedef, leaves)
+
+
+def _unflatten_from_leaves(leaves):
+    # the leaves are in sorted key chain order, so the nested dicts can be wrapped without sorting again
+    container_dict = dict()
+    for key_chain, value in leaves:
+        sub_dict = container_dict
+        for key in key_chain[:-1]:
+            sub_dict = sub_dict.setdefault(key, dict())
+        sub_dict[key_chain[-1]] = value
+    return _wrap_sorted_dict(container_dict)
+
+
+def _wrap_sorted_dict(dict_in):
+    return Container._from_sorted({key: _wrap_sorted_dict(value) if type(value) is dict else value
+                                   for key, value in dict_in.items()})
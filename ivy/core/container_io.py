@@ -0,0 +1,881 @@
+"""
+Container I/O, with the h5 metadata index, batch loaders, writers and the raw file format
+"""
+
+# global
+import os as _os
+import sys as _sys
+import json as _json
+import hashlib as _hashlib
+import struct as _struct
+import tempfile as _tempfile
+import queue as _queue
+import threading as _threading
+import weakref as _weakref
+import traceback as _traceback
+import collections as _collections
+import importlib.util as _importlib_util
+import numpy as _np
+from functools import reduce as _reduce
+from operator import mul as _mul
+
+# local
+from ivy.core import general as _ivy_gen
+
+__all__ = ['H5DatasetMetadata', 'H5Metadata', 'MultiprocessLoader', 'ContainerWriter', 'AsyncContainerWriter']
+
+
+# H5 Helpers #
+# -----------#
+
+def _lazy_import(module_name):
+    """
+    Import a module, deferring execution of the module until one of its attributes is first accessed.
+    """
+    if module_name in _sys.modules:
+        return _sys.modules[module_name]
+    spec = _importlib_util.find_spec(module_name)
+    if spec is None:
+        return
+    loader = _importlib_util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = _importlib_util.module_from_spec(spec)
+    _sys.modules[module_name] = module
+    loader.exec_module(module)
+    return module
+
+
+_h5py = _lazy_import('h5py')
+
+
+def _read_h5_dataset(dataset, slice_obj, out=None):
+    if out is None:
+        return dataset[slice_obj]
+    dataset.read_direct(out, source_sel=slice_obj)
+    return out
+
+
+def _write_h5_dataset(dataset, starting_index, value):
+    dataset[starting_index:starting_index + value.shape[0]] = value
+
+
+# dataset attribute holding the hash of the rows last written by an incremental Container.to_disk
+_H5_HASH_ATTR = 'ivy_incremental_hash'
+
+
+def _h5_hash(starting_index, value):
+    hasher = _hashlib.sha256()
+    hasher.update('{} {} {}'.format(starting_index, value.shape, value.dtype.str).encode('utf-8'))
+    hasher.update(_np.ascontiguousarray(value).data)
+    return hasher.hexdigest()
+
+
+def _invalidate_h5_hash(dataset):
+    # any write which is not recorded by an incremental save must remove the stale hash, which is checked once per
+    # dataset when it is opened for writing, rather than on every write
+    if _H5_HASH_ATTR in dataset.attrs:
+        del dataset.attrs[_H5_HASH_ATTR]
+
+
+def _create_h5_dataset(h5_obj, key, shape, dtype, chunks, compression, compression_opts):
+    if isinstance(chunks, int) and not isinstance(chunks, bool):
+        chunks = tuple([chunks] + [max(dim, 1) for dim in shape[1:]])
+    return h5_obj.create_dataset(key, shape, dtype=dtype, maxshape=[None for _ in shape], chunks=chunks,
+                                 compression=compression, compression_opts=compression_opts)
+
+
+def _h5_permutation(num_rows, seed_value, permutations):
+    # the same permutation as Container.shuffle, without seeding any global random state, shared by all datasets of
+    # equal length
+    if num_rows not in permutations:
+        perm = _np.random.RandomState(seed_value).permutation(num_rows).astype(_np.int64, copy=False)
+        inv_perm = _np.empty_like(perm)
+        inv_perm[perm] = _np.arange(num_rows, dtype=_np.int64)
+        permutations[num_rows] = (perm, inv_perm)
+    return permutations[num_rows]
+
+
+def _shuffle_h5_dataset(dataset, perm, inv_perm, memory_budget, tmp_dir):
+    """
+    Shuffle the rows of an h5 dataset, such that row perm[i] becomes row i, reading and writing contiguous blocks of
+    rows which fit in the memory budget. Datasets larger than the budget are shuffled out-of-core in two passes: the
+    first scatters each input block into buckets of a temporary file, one bucket per output block, and the second
+    permutes each bucket in memory and writes it back as a contiguous output block.
+    """
+    _invalidate_h5_hash(dataset)
+    num_rows = dataset.shape[0]
+    row_bytes = max(int(_np.prod(dataset.shape[1:])) * dataset.dtype.itemsize, 1)
+    block_rows = max(memory_budget // (2 * row_bytes), 1)
+    if block_rows >= num_rows:
+        dataset[...] = dataset[...][perm]
+        return
+    num_blocks = -(-num_rows // block_rows)
+    with _tempfile.TemporaryFile(dir=tmp_dir) as tmp_file, _h5py.File(tmp_file, 'w') as tmp_h5:
+        buckets = tmp_h5.create_dataset('buckets', dataset.shape, dataset.dtype)
+        bucket_fill = _np.arange(num_blocks, dtype=_np.int64) * block_rows
+
+        # pass 1, scatter contiguous input blocks into the buckets of their output blocks
+        for block_start in range(0, num_rows, block_rows):
+            block = dataset[block_start:block_start + block_rows]
+            block_buckets = inv_perm[block_start:block_start + block.shape[0]] // block_rows
+            order = _np.argsort(block_buckets, kind='stable')
+            block = block[order]
+            bucket_ids, run_starts, run_lengths = _np.unique(block_buckets[order], return_index=True,
+                                                             return_counts=True)
+            for bucket_id, run_start, run_length in zip(bucket_ids, run_starts, run_lengths):
+                write_start = bucket_fill[bucket_id]
+                buckets[write_start:write_start + run_length] = block[run_start:run_start + run_length]
+                bucket_fill[bucket_id] += run_length
+            del block
+
+        # pass 2, each bucket holds the rows of one output block, ordered by source row
+        for block_start in range(0, num_rows, block_rows):
+            block_end = min(block_start + block_rows, num_rows)
+            source_rows = _np.sort(perm[block_start:block_end])
+            bucket = buckets[block_start:block_end]
+            out_block = _np.empty_like(bucket)
+            out_block[inv_perm[source_rows] - block_start] = bucket
+            dataset[block_start:block_end] = out_block
+            del bucket, out_block
+
+
+def _shuffle_h5_group(h5_obj, seed_value, permutations, memory_budget, tmp_dir):
+    num_rows = 0
+    for key, value in sorted(h5_obj.items()):
+        if isinstance(value, _h5py.Group):
+            num_rows += _shuffle_h5_group(value, seed_value, permutations, memory_budget, tmp_dir)
+        elif isinstance(value, _h5py.Dataset):
+            if len(value.shape) == 0:
+                continue
+            perm, inv_perm = _h5_permutation(value.shape[0], seed_value, permutations)
+            _shuffle_h5_dataset(value, perm, inv_perm, memory_budget, tmp_dir)
+            num_rows += value.shape[0]
+        else:
+            raise Exception('Item found inside h5_obj which was neither a Group nor a Dataset.')
+    return num_rows
+
+
+# absolute filepath -> (modification time, file size, H5Metadata) of each indexed file
+_h5_metadata_cache = dict()
+
+
+# Raw Files #
+# ----------#
+
+# raw container files are the magic bytes, the header length as a little endian uint64, a json header of the key
+# chain, dtype, shape and blob offset of each array, and then the blob of all arrays, each aligned to 64 bytes
+_RAW_MAGIC = b'\x93IVYCONT'
+_RAW_ALIGNMENT = 64
+
+
+def _align(num_bytes):
+    return -(-num_bytes // _RAW_ALIGNMENT) * _RAW_ALIGNMENT
+
+
+def _save_raw(filepath, leaves):
+    entries, num_bytes = list(), 0
+    for key_chain, value in leaves:
+        entries.append([key_chain, value.dtype.str, list(value.shape), num_bytes])
+        num_bytes = _align(num_bytes + value.nbytes)
+    header = _json.dumps({'entries': entries}).encode('utf-8')
+    blob_offset = _align(len(_RAW_MAGIC) + 8 + len(header))
+    with open(filepath, 'wb') as file:
+        file.write(_RAW_MAGIC + _struct.pack('<Q', len(header)) + header)
+        for (key_chain, value), (_, _, _, offset) in zip(leaves, entries):
+            file.seek(blob_offset + offset)
+            file.write(_np.ascontiguousarray(value).tobytes())
+        file.truncate(blob_offset + num_bytes)
+
+
+def _load_raw(filepath, mmap):
+    with open(filepath, 'rb') as file:
+        header_size = _struct.unpack('<Q', file.read(len(_RAW_MAGIC) + 8)[len(_RAW_MAGIC):])[0]
+        entries = _json.loads(file.read(header_size).decode('utf-8'))['entries']
+        blob_offset = _align(len(_RAW_MAGIC) + 8 + header_size)
+        if mmap:
+            blob = _np.memmap(file, _np.uint8, 'r')[blob_offset:]
+        else:
+            file.seek(blob_offset)
+            blob = _np.fromfile(file, _np.uint8)
+    leaves = list()
+    for key_chain, dtype_str, shape, offset in entries:
+        dtype = _np.dtype(dtype_str)
+        num_bytes = _reduce(_mul, shape, 1) * dtype.itemsize
+        leaves.append((key_chain, blob[offset:offset + num_bytes].view(dtype).reshape(shape)))
+    return leaves
+
+
+# H5 Metadata #
+# ------------#
+
+H5DatasetMetadata = _collections.namedtuple(
+    'H5DatasetMetadata', ['shape', 'dtype', 'nbytes', 'batch_size', 'chunks', 'compression', 'offset'])
+
+
+class H5Metadata:
+    """
+    Metadata index of all groups and datasets of an h5 file, computed in a single walk of the file, so that loaders
+    and lazy views can plan their reads without touching the h5 groups again.
+    """
+
+    def __init__(self, h5_obj):
+        """
+        Initialize metadata index of an h5 object. The index is computed once, and does not update if the file changes.
+
+        :param h5_obj: H5 file or group to index.
+        :type h5_obj: h5 obj
+        """
+        self.filename = h5_obj.file.filename
+        # key chain -> H5DatasetMetadata of each dataset, with offset the file offset of contiguous datasets which can
+        # be memory mapped, in sorted key chain order
+        self.datasets = _collections.OrderedDict()
+        self.groups = list()
+        memmappable = h5_obj.file.driver in ['sec2', 'stdio']
+        self._index_group(h5_obj, '', memmappable)
+        self.size = sum([dataset.nbytes for dataset in self.datasets.values()])
+        self.batch_size = list(self.datasets.values())[-1].batch_size if self.datasets else 0
+
+    def _index_group(self, h5_obj, key_chain, memmappable):
+        for key, value in sorted(h5_obj.items()):
+            sub_key_chain = key_chain + key
+            if isinstance(value, _h5py.Group):
+                self.groups.append(sub_key_chain)
+                self._index_group(value, sub_key_chain + '/', memmappable)
+            elif isinstance(value, _h5py.Dataset):
+                shape = value.shape
+                offset = None
+                if memmappable and value.chunks is None and value.compression is None and \
+                        not value.dtype.hasobject and shape:
+                    offset = value.id.get_offset()
+                self.datasets[sub_key_chain] = H5DatasetMetadata(
+                    shape, value.dtype, _reduce(_mul, shape, 1) * value.dtype.itemsize, shape[0] if shape else 0,
+                    value.chunks, value.compression, offset)
+            else:
+                raise Exception('Item found inside h5_obj which was neither a Group nor a Dataset.')
+
+
+# Loaders #
+# --------#
+
+def _stop_prefetching(stop_event, h5_obj):
+    stop_event.set()
+    if h5_obj:
+        h5_obj.close()
+
+
+class _PrefetchingBatchIterator:
+    """
+    Iterator over batches of an h5 file, which reads ahead in a background thread.
+    """
+
+    _end = object()
+
+    def __init__(self, h5_obj_or_filepath, f, batch_size, shuffle, seed_value, drop_last, num_prefetch):
+        if type(h5_obj_or_filepath) is str:
+            self._h5_obj = _h5py.File(h5_obj_or_filepath, 'r')
+            self._owns_file = True
+        else:
+            self._h5_obj = h5_obj_or_filepath
+            self._owns_file = False
+        self._f = f
+        # imported here rather than at module level, as ivy.core.container imports this module
+        from ivy.core.container import Container
+        self._container_class = Container
+        _, num_rows = Container.h5_file_size(self._h5_obj)
+        if shuffle:
+            indices = _np.random.RandomState(seed_value).permutation(num_rows)
+        else:
+            indices = None
+        self._index_objs = list()
+        for start in range(0, num_rows, batch_size):
+            stop = min(start + batch_size, num_rows)
+            if drop_last and stop - start < batch_size:
+                break
+            self._index_objs.append(slice(start, stop) if indices is None else indices[start:stop])
+        self._queue = _queue.Queue(maxsize=max(num_prefetch, 1))
+        self._stop_event = _threading.Event()
+        # the thread only holds a weak reference, so that an iterator which is dropped without being closed is still
+        # finalized, stopping the thread and closing the file
+        self._finalizer = _weakref.finalize(self, _stop_prefetching, self._stop_event,
+                                            self._h5_obj if self._owns_file else None)
+        self._thread = _threading.Thread(target=_PrefetchingBatchIterator._read_batches, args=(
+            _weakref.ref(self), self._index_objs, self._queue, self._stop_event), daemon=True)
+        self._thread.start()
+
+    def _read_batch(self, index_obj):
+        if isinstance(index_obj, slice):
+            batch = self._container_class.from_disk(self._h5_obj, _np, index_obj)
+        else:
+            # h5py requires increasing indices, so read in sorted order and then restore the shuffled order
+            order = _np.argsort(index_obj)
+            restore_order = _np.empty_like(order)
+            restore_order[order] = _np.arange(len(order))
+            batch = self._container_class.from_disk(self._h5_obj, _np, index_obj[order])
+            batch = batch.map(lambda x, _: x[restore_order])
+        if self._f is _np or getattr(self._f, '__name__', None) == 'ivy.numpy':
+            return batch
+        return batch.map(lambda x, _: _ivy_gen.array(x, f=self._f))
+
+    @staticmethod
+    def _put(queue, stop_event, item):
+        while not stop_event.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except _queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _read_batches(iterator_ref, index_objs, queue, stop_event):
+        put = _PrefetchingBatchIterator._put
+        try:
+            for index_obj in index_objs:
+                iterator = iterator_ref()
+                if iterator is None or stop_event.is_set():
+                    return
+                batch = iterator._read_batch(index_obj)
+                del iterator
+                if not put(queue, stop_event, batch):
+                    return
+        except Exception as e:
+            # the traceback frames would otherwise keep the iterator alive
+            iterator = None
+            _traceback.clear_frames(e.__traceback__)
+            put(queue, stop_event, e)
+        put(queue, stop_event, _PrefetchingBatchIterator._end)
+
+    def __len__(self):
+        return len(self._index_objs)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._stop_event.is_set():
+            raise StopIteration
+        item = self._queue.get()
+        if item is self._end:
+            self.close()
+            raise StopIteration
+        if isinstance(item, Exception):
+            self.close()
+            raise item
+        return item
+
+    def close(self):
+        """
+        Stop reading ahead, and close the h5 file if it was opened by this iterator.
+        """
+        self._stop_event.set()
+        if self._thread is not _threading.current_thread():
+            self._thread.join()
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _ChunkCache:
+    """
+    Thread-safe least-recently-used cache of dataset chunks, bounded by the total number of bytes.
+    """
+
+    def __init__(self, max_bytes):
+        self._max_bytes = max_bytes
+        self._num_bytes = 0
+        self._chunks = _collections.OrderedDict()
+        self._lock = _threading.Lock()
+
+    def get(self, key, load_fn):
+        with self._lock:
+            if key in self._chunks:
+                self._chunks.move_to_end(key)
+                return self._chunks[key]
+        chunk = load_fn()
+        with self._lock:
+            if key not in self._chunks:
+                self._chunks[key] = chunk
+                self._num_bytes += chunk.nbytes
+            while self._num_bytes > self._max_bytes and len(self._chunks) > 1:
+                _, evicted = self._chunks.popitem(last=False)
+                self._num_bytes -= evicted.nbytes
+        return chunk
+
+
+def _h5_memmap(filename, metadata):
+    # contiguous, uncompressed datasets with a simple dtype can be memory mapped directly from the file
+    if metadata.offset is None:
+        return
+    return _np.memmap(filename, dtype=metadata.dtype, mode='r', offset=metadata.offset, shape=metadata.shape)
+
+
+class _LazyDataset:
+    """
+    Handle to an h5 dataset, which reads only the requested rows, either from a memory map of the file, or in chunks
+    of rows through the chunk cache. The h5 dataset itself is only opened if it cannot be memory mapped.
+    """
+
+    def __init__(self, h5_obj, key_chain, metadata, filename, cache):
+        self._h5_obj = h5_obj
+        self._key_chain = key_chain
+        self._h5_dataset = None
+        self._cache = cache
+        self.shape = metadata.shape
+        self._dtype = metadata.dtype
+        self._memmap = _h5_memmap(filename, metadata)
+        if metadata.chunks is not None:
+            self._chunk_rows = metadata.chunks[0]
+        else:
+            row_bytes = max(int(_np.prod(metadata.shape[1:])) * metadata.dtype.itemsize, 1)
+            self._chunk_rows = max(int(2**20) // row_bytes, 1)
+
+    @property
+    def _dataset(self):
+        if self._h5_dataset is None:
+            self._h5_dataset = self._h5_obj[self._key_chain]
+        return self._h5_dataset
+
+    def _read_chunk(self, chunk_idx):
+        return _read_h5_dataset(self._dataset, slice(chunk_idx * self._chunk_rows, (chunk_idx + 1) * self._chunk_rows))
+
+    def rows(self, row_slices):
+        rows = range(self.shape[0])
+        for row_slice in row_slices:
+            rows = rows[row_slice]
+        return rows
+
+    def read(self, row_slices, trailing_slices):
+        if not self.shape:
+            return _read_h5_dataset(self._dataset, ())
+        rows = self.rows(row_slices)
+        if len(rows) == 0:
+            block = _np.empty((0,) + tuple(self.shape[1:]), self._dtype)
+        elif self._memmap is not None:
+            block = _np.asarray(self._memmap[_np.asarray(rows)] if rows.step < 0 else
+                                self._memmap[rows.start:rows.stop:rows.step])
+        else:
+            low, high = min(rows[0], rows[-1]), max(rows[0], rows[-1]) + 1
+            first_chunk, last_chunk = low // self._chunk_rows, (high - 1) // self._chunk_rows
+            chunks = [self._cache.get((self, chunk_idx), lambda idx=chunk_idx: self._read_chunk(idx))
+                      for chunk_idx in range(first_chunk, last_chunk + 1)]
+            block = chunks[0] if len(chunks) == 1 else _np.concatenate(chunks)
+            offset = first_chunk * self._chunk_rows
+            if rows.step == 1:
+                block = block[low - offset:high - offset]
+            else:
+                block = block[_np.asarray(rows) - offset]
+        if trailing_slices:
+            block = block[(slice(None),) + tuple(trailing_slices)]
+        return block
+
+
+def _flatten_to_leaves(container, key_chain=()):
+    for key, value in sorted(container.items()):
+        if isinstance(value, dict):
+            yield from _flatten_to_leaves(value, key_chain + (key,))
+        else:
+            yield key_chain + (key,), value
+
+
+def _container_to_shared_memory(container):
+    # copy all array leaves into one contiguous shared memory segment, and describe them with picklable metadata
+    from multiprocessing import shared_memory
+    arrays, leaves, num_bytes = list(), list(), 0
+    for key_chain, value in _flatten_to_leaves(container):
+        if not isinstance(value, _np.ndarray) and hasattr(value, 'shape'):
+            value = _ivy_gen.to_numpy(value)
+        if isinstance(value, _np.ndarray) and not value.dtype.hasobject:
+            arrays.append((num_bytes, value))
+            leaves.append((key_chain, 'array', (value.dtype.str, value.shape, num_bytes)))
+            num_bytes += -(-value.nbytes // 64) * 64
+        else:
+            leaves.append((key_chain, 'object', value))
+    shm = shared_memory.SharedMemory(create=True, size=max(num_bytes, 1))
+    if _os.name == 'posix':
+        # the parent process takes ownership of the segment, and unlinks it once attached
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    for offset, value in arrays:
+        _np.ndarray(value.shape, value.dtype, shm.buf, offset)[...] = value
+    shm.close()
+    return shm.name, leaves
+
+
+# shared memory segments whose numpy views have been freed, closed when the next batch is attached
+_shm_pending_release = list()
+
+
+def _release_pending_shm():
+    # a segment can only be closed after the base array viewing it has been fully deallocated, which is after its
+    # finalizer is called, so the segments are closed later rather than from within the finalizer
+    for _ in range(len(_shm_pending_release)):
+        shm = _shm_pending_release.pop(0)
+        try:
+            shm.close()
+        except BufferError:
+            _shm_pending_release.append(shm)
+
+
+def _loader_worker(batch_fn, task_queue, result_queue):
+    while True:
+        batch_idx = task_queue.get()
+        if batch_idx is None:
+            return
+        try:
+            result_queue.put((batch_idx, None, _container_to_shared_memory(batch_fn(batch_idx))))
+        except Exception:
+            result_queue.put((batch_idx, _traceback.format_exc(), None))
+
+
+class MultiprocessLoader:
+
+    def __init__(self, batch_fn, num_batches, f=None, num_workers=4, num_prefetch=2, start_method=None):
+        """
+        Iterator over batches produced by batch_fn in a pool of worker processes, in order of batch index.
+        Each batch container is copied into a single shared memory segment by the worker, and the parent
+        reconstructs the container with its array entries as views into that segment, without pickling any arrays.
+        The segment is unlinked as soon as it is attached, and its memory is released once all entries of the batch
+        are no longer referenced.
+
+        :param batch_fn: Picklable function of batch index, returning a container of numpy arrays.
+        :type batch_fn: callable
+        :param num_batches: Number of batches to produce.
+        :type num_batches: int
+        :param f: Machine learning framework of the returned entries. Numpy and torch entries are created without
+                  copying, other frameworks copy the shared memory once. Default is numpy.
+        :type f: ml_framework, optional
+        :param num_workers: Number of worker processes. Default is 4.
+        :type num_workers: int, optional
+        :param num_prefetch: Number of batches to produce ahead, per worker. Default is 2.
+        :type num_prefetch: int, optional
+        :param start_method: Multiprocessing start method, ['fork', 'spawn', 'forkserver']. Default is the platform
+                             default.
+        :type start_method: str, optional
+        """
+        import multiprocessing
+        context = multiprocessing.get_context(start_method)
+        self._f = f
+        self._num_batches = num_batches
+        self._task_queue = context.Queue()
+        self._result_queue = context.Queue()
+        self._workers = [context.Process(target=_loader_worker, args=(batch_fn, self._task_queue, self._result_queue),
+                                         daemon=True) for _ in range(num_workers)]
+        for worker in self._workers:
+            worker.start()
+        self._num_submitted = 0
+        self._next_idx = 0
+        self._ready = dict()
+        self._closed = False
+        for _ in range(min(num_workers * num_prefetch, num_batches)):
+            self._submit()
+
+    def _submit(self):
+        if self._num_submitted < self._num_batches:
+            self._task_queue.put(self._num_submitted)
+            self._num_submitted += 1
+
+    def _to_framework(self, x):
+        if self._f is None or self._f is _np or getattr(self._f, '__name__', None) == 'ivy.numpy':
+            return x
+        if getattr(self._f, '__name__', None) == 'ivy.torch':
+            import torch
+            return torch.from_numpy(x)
+        return _ivy_gen.array(x, f=self._f)
+
+    def _attach(self, shm_name, leaves):
+        from multiprocessing import shared_memory
+        # imported here rather than at module level, as ivy.core.container imports this module
+        from ivy.core.container import _unflatten_from_leaves
+        shm = shared_memory.SharedMemory(name=shm_name)
+        shm.unlink()
+        base = _np.frombuffer(shm.buf, _np.uint8)
+        _weakref.finalize(base, _shm_pending_release.append, shm)
+        values = list()
+        for key_chain, kind, payload in leaves:
+            if kind == 'array':
+                dtype_str, shape, offset = payload
+                dtype = _np.dtype(dtype_str)
+                num_bytes = int(_np.prod(shape)) * dtype.itemsize
+                value = self._to_framework(base[offset:offset + num_bytes].view(dtype).reshape(shape))
+            else:
+                value = payload
+            values.append((key_chain, value))
+        del base
+        return _unflatten_from_leaves(values)
+
+    def __len__(self):
+        return self._num_batches
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._closed or self._next_idx >= self._num_batches:
+            self.close()
+            raise StopIteration
+        _release_pending_shm()
+        while self._next_idx not in self._ready:
+            try:
+                batch_idx, error, result = self._result_queue.get(timeout=1.)
+            except _queue.Empty:
+                if any([worker.exitcode not in [None, 0] for worker in self._workers]):
+                    self.close()
+                    raise Exception('A loader worker process exited unexpectedly.')
+                continue
+            if error is not None:
+                self.close()
+                raise Exception('Worker failed to produce batch {}:\n{}'.format(batch_idx, error))
+            self._ready[batch_idx] = result
+        shm_name, leaves = self._ready.pop(self._next_idx)
+        self._next_idx += 1
+        self._submit()
+        return self._attach(shm_name, leaves)
+
+    def close(self):
+        """
+        Stop the worker processes, and release all shared memory which is no longer referenced.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._workers:
+            self._task_queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        # unlink the segments of batches which were produced but never consumed
+        from multiprocessing import shared_memory
+        unconsumed = list(self._ready.values())
+        self._ready.clear()
+        while True:
+            try:
+                batch_idx, error, result = self._result_queue.get(timeout=0.1)
+            except _queue.Empty:
+                break
+            if result is not None:
+                unconsumed.append(result)
+        for shm_name, _ in unconsumed:
+            shm = shared_memory.SharedMemory(name=shm_name)
+            shm.close()
+            shm.unlink()
+        _release_pending_shm()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# Writers #
+# --------#
+
+class ContainerWriter:
+
+    def __init__(self, h5_obj_or_filepath, starting_index=None, mode='a', chunks=True, compression=None,
+                 compression_opts=None, buffer_size=1):
+        """
+        Writer which appends containers to an h5 file along axis 0, keeping the file and datasets open across calls.
+        Datasets are created on the first flush, and resized as containers are appended. Several appended containers
+        can be buffered in memory, and written together as one contiguous write per dataset.
+
+        :param h5_obj_or_filepath: Filepath for where to save the containers to disk, or h5 object.
+        :type h5_obj_or_filepath: str or h5 object
+        :param starting_index: Batch index for which to start writing to file. Default is after the existing entries.
+        :type starting_index: int, optional
+        :param mode: H5 read/write mode for writing to disk, ['r+', 'w', 'w-', 'a'], default is 'a'.
+        :type mode: str, optional
+        :param chunks: Chunk shape of new datasets, or number of entries along axis 0 per chunk, with the remaining
+                       dimensions unchunked. Default is True, for the h5py automatic chunk shape.
+        :type chunks: bool or int or sequence of ints, optional
+        :param compression: Compression filter of new datasets, ['gzip', 'lzf', None]. Default is None.
+        :type compression: str, optional
+        :param compression_opts: Compression level for gzip, between 0 and 9.
+        :type compression_opts: int, optional
+        :param buffer_size: Number of appended containers to buffer before writing to disk. Default is 1.
+        :type buffer_size: int, optional
+        """
+        if type(h5_obj_or_filepath) is str:
+            self._h5_obj = _h5py.File(h5_obj_or_filepath, mode)
+            self._owns_file = True
+        else:
+            self._h5_obj = h5_obj_or_filepath
+            self._owns_file = False
+        self._index = starting_index
+        self._chunks = chunks
+        self._compression = compression
+        self._compression_opts = compression_opts
+        self._buffer_size = max(buffer_size, 1)
+        self._buffer = list()
+        self._datasets = dict()
+
+    def _dataset(self, key_chain, value):
+        if key_chain not in self._datasets:
+            h5_obj = self._h5_obj
+            for key in key_chain[:-1]:
+                h5_obj = h5_obj.require_group(key)
+            if key_chain[-1] in h5_obj:
+                dataset = h5_obj[key_chain[-1]]
+                _invalidate_h5_hash(dataset)
+            else:
+                dataset = _create_h5_dataset(h5_obj, key_chain[-1], [0] + list(value.shape[1:]), value.dtype,
+                                             self._chunks, self._compression, self._compression_opts)
+            self._datasets[key_chain] = dataset
+        return self._datasets[key_chain]
+
+    def append(self, container):
+        """
+        Append a container, with the same structure as all previously appended containers.
+
+        :param container: Container to append along axis 0.
+        :type container: Container
+        """
+        self._append_leaves([(key_chain, value if isinstance(value, _np.ndarray) else _ivy_gen.to_numpy(value))
+                             for key_chain, value in _flatten_to_leaves(container)])
+
+    def _append_leaves(self, leaves):
+        if self._buffer_size > 1:
+            # the buffered values must not change if the source arrays are modified before flushing
+            leaves = [(key_chain, _np.array(value)) for key_chain, value in leaves]
+        self._buffer.append(leaves)
+        if len(self._buffer) >= self._buffer_size:
+            self._write_buffer()
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+        num_written = 0
+        for leaf_idx, (key_chain, value) in enumerate(self._buffer[0]):
+            if len(self._buffer) == 1:
+                values = value
+            else:
+                values = _np.concatenate([leaves[leaf_idx][1] for leaves in self._buffer])
+            dataset = self._dataset(key_chain, values)
+            if self._index is None:
+                self._index = dataset.shape[0]
+            if dataset.shape[0] < self._index + values.shape[0]:
+                dataset.resize(self._index + values.shape[0], axis=0)
+            _write_h5_dataset(dataset, self._index, values)
+            num_written = values.shape[0]
+        self._index += num_written
+        self._buffer.clear()
+
+    def flush(self):
+        """
+        Write all buffered containers to disk, and flush the h5 file.
+        """
+        self._write_buffer()
+        self._h5_obj.file.flush()
+
+    def close(self):
+        """
+        Write all buffered containers to disk, and close the h5 file if it was opened by this writer.
+        """
+        if self._h5_obj is None:
+            return
+        self.flush()
+        if self._owns_file:
+            self._h5_obj.close()
+        self._h5_obj = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncContainerWriter(ContainerWriter):
+
+    _end = object()
+
+    def __init__(self, h5_obj_or_filepath, starting_index=None, mode='a', chunks=True, compression=None,
+                 compression_opts=None, buffer_size=1, max_queue_size=2):
+        """
+        Writer which appends containers to an h5 file along axis 0 in a background thread. Each appended container
+        is copied into one of max_queue_size reusable sets of numpy buffers, so the source can be modified as soon as
+        append returns. Once all buffer sets are queued for writing, append blocks until one has been written.
+        See ContainerWriter for the remaining arguments.
+
+        :param max_queue_size: Number of buffer sets, and so the maximum number of containers queued for writing.
+                               Default is 2, for double buffering.
+        :type max_queue_size: int, optional
+        """
+        super(AsyncContainerWriter, self).__init__(h5_obj_or_filepath, starting_index, mode, chunks, compression,
+                                                   compression_opts, buffer_size)
+        self._free_snapshots = _queue.Queue()
+        for _ in range(max(max_queue_size, 1)):
+            self._free_snapshots.put(None)
+        self._snapshots = _queue.Queue()
+        self._error = None
+        self._thread = _threading.Thread(target=self._write_snapshots, daemon=True)
+        self._thread.start()
+
+    def _write_snapshots(self):
+        while True:
+            snapshot = self._snapshots.get()
+            try:
+                if snapshot is self._end:
+                    return
+                if self._error is None:
+                    self._append_leaves(snapshot)
+            except Exception as e:
+                self._error = e
+            finally:
+                if snapshot is not self._end:
+                    self._free_snapshots.put(snapshot)
+                self._snapshots.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def append(self, container):
+        """
+        Copy a container, with the same structure as all previously appended containers, and queue it for appending.
+        Blocks while all buffer sets are queued for writing.
+
+        :param container: Container to append along axis 0.
+        :type container: Container
+        """
+        self._raise_error()
+        leaves = [(key_chain, value if isinstance(value, _np.ndarray) else _ivy_gen.to_numpy(value))
+                  for key_chain, value in _flatten_to_leaves(container)]
+        snapshot = self._free_snapshots.get()
+        if snapshot is None or [(key_chain, buffer.shape, buffer.dtype) for key_chain, buffer in snapshot] != \
+                [(key_chain, value.shape, value.dtype) for key_chain, value in leaves]:
+            snapshot = [(key_chain, _np.empty(value.shape, value.dtype)) for key_chain, value in leaves]
+        for (_, buffer), (_, value) in zip(snapshot, leaves):
+            _np.copyto(buffer, value)
+        self._snapshots.put(snapshot)
+
+    def flush(self):
+        """
+        Wait for all queued containers to be written, write any buffered containers to disk, and flush the h5 file.
+        """
+        self._snapshots.join()
+        self._raise_error()
+        super(AsyncContainerWriter, self).flush()
+
+    def close(self):
+        """
+        Write all queued and buffered containers to disk, stop the background thread, and close the h5 file if it
+        was opened by this writer.
+        """
+        if self._h5_obj is None:
+            return
+        try:
+            self._snapshots.join()
+        finally:
+            self._snapshots.put(self._end)
+            self._thread.join()
+        try:
+            self._raise_error()
+        finally:
+            super(AsyncContainerWriter, self).close()
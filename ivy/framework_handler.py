@@ -1,9 +1,23 @@
+import ast
+import sys
+import types
+import inspect
+import functools
 import importlib
+import contextvars
 
 from ivy import verbosity
 
 
-framework_stack = []
+# the framework stack is held per thread and per asyncio task, as an immutable tuple
+_framework_stack = contextvars.ContextVar('framework_stack', default=())
+
+
+def __getattr__(name):
+    # read-only snapshot, use set_framework and unset_framework to modify the stack
+    if name == 'framework_stack':
+        return _framework_stack.get()
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
 
 
 class ContextManager:
@@ -11,16 +25,10 @@ class ContextManager:
         self.module = module
 
     def __enter__(self):
-        framework_stack.append(self.module)
-        if verbosity.level > 0:
-            verbosity.cprint(
-                'framework stack: {}'.format(framework_stack))
+        set_framework(self.module)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        framework_stack.pop(-1)
-        if verbosity.level > 0:
-            verbosity.cprint(
-                'framework stack: {}'.format(framework_stack))
+        unset_framework()
 
 
 _array_types = dict()
@@ -32,56 +40,271 @@ _array_types['mxnet.ndarray.ndarray'] = 'ivy.mxnd'
 _array_types['mxnet.symbol.symbol'] = 'ivy.mxsym'
 
 
+# resolved array type -> ivy backend module, with None cached for types which are not arrays of any framework
+_framework_cache = dict()
+
+
+def _framework_from_type(arg_type):
+    module_name = _array_types.get(arg_type.__module__)
+    f = importlib.import_module(module_name) if module_name else None
+    _framework_cache[arg_type] = f
+    return f
+
+
 def _get_framework_from_args(args):
     for arg in args:
         arg_type = type(arg)
-        if arg_type in [list, tuple]:
-            lib = _get_framework_from_args(*arg)
-            if lib:
-                return lib
-        elif arg_type is dict:
-            lib = _get_framework_from_args(*list(arg.values()))
-            if lib:
-                return lib
+        if arg_type in _framework_cache:
+            f = _framework_cache[arg_type]
+        elif arg_type in (list, tuple):
+            f = _get_framework_from_args(arg)
+        elif isinstance(arg, dict):
+            f = _get_framework_from_args(arg.values())
         else:
-            if arg.__class__.__module__ in _array_types:
-                module_name = _array_types[arg.__class__.__module__]
-                return importlib.import_module(module_name)
+            f = _framework_from_type(arg_type)
+        if f:
+            return f
 
 
 def get_framework(*args, f=None, **kwargs):
     """Priorities: framework > global_framework > input's framework."""
 
     if f:
-        if verbosity.level > 0:
-            verbosity.cprint('Using provided framework: {}'.format(f))
         return f
 
+    framework_stack = _framework_stack.get()
     if framework_stack:
-        f = framework_stack[-1]
-        if verbosity.level > 0:
-            verbosity.cprint('Using framework from stack: {}'.format(f))
-        return f
+        return framework_stack[-1]
 
-    f = _get_framework_from_args(list(args) + list(kwargs.values()))
+    f = _get_framework_from_args(args) or _get_framework_from_args(kwargs.values())
     if f is None:
         raise ValueError(
             'get_framework failed to find a valid library from the inputs: '
             '{} {}'.format(args, kwargs))
-    if verbosity.level > 0:
-        verbosity.cprint('Using framework from type: {}'.format(f))
     return f
 
 
 def set_framework(f):
-    framework_stack.append(f)
-    if verbosity.level > 0:
-        verbosity.cprint(
-            'framework stack: {}'.format(framework_stack))
+    """
+    Push a framework onto the framework stack of the current thread or asyncio task.
+
+    :param f: Machine learning framework to use for all templated ivy calls which do not specify one.
+    :type f: ml_framework
+    """
+    _framework_stack.set(_framework_stack.get() + (f,))
 
 
 def unset_framework():
-    framework_stack.pop(-1)
-    if verbosity.level > 0:
-        verbosity.cprint(
-            'framework stack: {}'.format(framework_stack))
+    """
+    Pop the most recently set framework from the framework stack of the current thread or asyncio task.
+    """
+    _framework_stack.set(_framework_stack.get()[:-1])
+
+
+# Dispatch Tracing #
+# -----------------#
+
+def _traced_dispatch(quiet_get_framework, quiet_set_framework, quiet_unset_framework):
+
+    @functools.wraps(quiet_get_framework)
+    def traced_get_framework(*args, f=None, **kwargs):
+        if f:
+            source = 'explicit'
+        elif _framework_stack.get():
+            source = 'stack'
+        else:
+            source = 'inferred'
+        f = quiet_get_framework(*args, f=f, **kwargs)
+        verbosity.record(sys._getframe(1).f_code.co_name, f, source)
+        return f
+
+    @functools.wraps(quiet_set_framework)
+    def traced_set_framework(f):
+        quiet_set_framework(f)
+        verbosity.record('set_framework', f, 'push')
+
+    @functools.wraps(quiet_unset_framework)
+    def traced_unset_framework():
+        framework_stack = _framework_stack.get()
+        quiet_unset_framework()
+        verbosity.record('unset_framework', framework_stack[-1] if framework_stack else None, 'pop')
+
+    return traced_get_framework, traced_set_framework, traced_unset_framework
+
+
+# the dispatch functions are swapped wholesale, so that the untraced path carries no verbosity checks at all
+_dispatch_fns = {False: (get_framework, set_framework, unset_framework)}
+_dispatch_fns[True] = _traced_dispatch(*_dispatch_fns[False])
+
+
+def rebind(old, new):
+    """
+    Replace every reference to an object held at the top level of the loaded ivy modules, including the private
+    aliases which the templated functions call through.
+
+    :param old: Object currently referenced by the ivy modules.
+    :param new: Object to reference in its place.
+    """
+    for module_name, module in list(sys.modules.items()):
+        if module is None or not (module_name == 'ivy' or module_name.startswith('ivy.')):
+            continue
+        module_dict = module.__dict__
+        for name, value in list(module_dict.items()):
+            if value is old:
+                module_dict[name] = new
+
+
+def _install_dispatch(traced):
+    for current_fn, new_fn in zip(_dispatch_fns[not traced], _dispatch_fns[traced]):
+        rebind(current_fn, new_fn)
+
+
+# Function Wrapping #
+# ------------------#
+
+_backend_names = ['numpy', 'jax', 'tensorflow', 'torch', 'mxnd', 'mxsym']
+
+
+def install_wrappers(templated_wrapper, backend_wrapper=None):
+    """
+    Wrap every templated ivy function, wherever the loaded ivy modules reference it, and optionally also the matching
+    functions of every currently imported backend. Wrappers which are already installed are wrapped in turn, so
+    installations compose, and should be removed in reverse order.
+
+    :param templated_wrapper: Callable which takes a templated function and returns its replacement.
+    :type templated_wrapper: callable
+    :param backend_wrapper: Callable which takes a backend function and the framework name, and returns its replacement.
+    :type backend_wrapper: callable, optional
+    :return: Callable which removes the installed wrappers again.
+    """
+    installed = list()
+    names = set()
+    for module, name, _ in templated_functions():
+        current_fn = module.__dict__[name]
+        new_fn = templated_wrapper(current_fn)
+        rebind(current_fn, new_fn)
+        installed.append((current_fn, new_fn))
+        names.add(name)
+    installed_backend = list()
+    if backend_wrapper is not None:
+        for framework_name in _backend_names:
+            backend = sys.modules.get('ivy.' + framework_name)
+            if backend is None:
+                continue
+            for name in names:
+                current_fn = backend.__dict__.get(name)
+                if callable(current_fn):
+                    setattr(backend, name, backend_wrapper(current_fn, framework_name))
+                    installed_backend.append((backend, name, current_fn))
+
+    def uninstall():
+        for backend_, name_, fn in reversed(installed_backend):
+            setattr(backend_, name_, fn)
+        for fn, wrapper in reversed(installed):
+            rebind(wrapper, fn)
+
+    return uninstall
+
+
+# Pinned Frameworks #
+# ------------------#
+
+_pinned_namespaces = dict()
+
+
+def _templated_modules():
+    import ivy.core
+    import ivy.neural_net
+    return [ivy.core.general, ivy.core.gradients, ivy.core.image, ivy.core.linalg, ivy.core.logic, ivy.core.math,
+            ivy.core.random, ivy.core.reductions, ivy.neural_net.activations, ivy.neural_net.layers]
+
+
+def templated_functions():
+    """
+    Iterate over all templated functions of ivy.core and ivy.neural_net, as they are originally defined.
+
+    :return: Generator of (module, function name, function) tuples.
+    """
+    for module in _templated_modules():
+        for name, fn in module.__dict__.items():
+            if name[0] != '_' and inspect.isfunction(fn) and fn.__module__ == module.__name__:
+                yield module, name, inspect.unwrap(fn)
+
+
+def _backend_call_args(fn):
+    """Argument names of the backend call in a templated function, or None if it is not a plain forward."""
+    # noinspection PyBroadException
+    try:
+        fn_def = ast.parse(inspect.getsource(fn)).body[0]
+    except Exception:
+        return
+    statements = [node for node in fn_def.body if not (isinstance(node, ast.Expr) and
+                                                        isinstance(node.value, ast.Constant))]
+    ret = statements[-1]
+    if not (len(statements) == 1 and isinstance(ret, ast.Return) and isinstance(ret.value, ast.Call)
+            and not ret.value.keywords and isinstance(ret.value.func, ast.Attribute) and isinstance(ret.value.func.value, ast.Call)
+            and getattr(ret.value.func.value.func, 'id', None) == '_get_framework'):
+        return
+    if not all([isinstance(arg, ast.Name) for arg in ret.value.args]):
+        return
+    return [arg.id for arg in ret.value.args]
+
+
+def _can_bind_directly(fn, backend_fn, arg_names):
+    fn_params = list(inspect.signature(fn).parameters.values())[:-1]
+    if arg_names != [param.name for param in fn_params]:
+        return False
+    # noinspection PyBroadException
+    try:
+        backend_params = list(inspect.signature(backend_fn).parameters.values())
+    except Exception:
+        return False
+    if len(backend_params) < len(fn_params):
+        return False
+    for fn_param, backend_param in zip(fn_params, backend_params):
+        if backend_param.name != fn_param.name or backend_param.default is not fn_param.default or \
+                backend_param.kind is not inspect.Parameter.POSITIONAL_OR_KEYWORD:
+            return False
+    return all([param.default is not inspect.Parameter.empty or param.kind in
+                [inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD]
+                for param in backend_params[len(fn_params):]])
+
+
+def _pinned_function(fn, f):
+    backend_fn = getattr(f, fn.__name__)
+    arg_names = _backend_call_args(fn)
+    if arg_names is None or list(inspect.signature(fn).parameters)[-1] != 'f' or 'f' in arg_names:
+        return lambda *args, **kwargs: fn(*args, f=f, **kwargs)
+    if _can_bind_directly(fn, backend_fn, arg_names):
+        return backend_fn
+    param_names = list(inspect.signature(fn).parameters)[:-1]
+    namespace = {'_backend_fn': backend_fn}
+    exec('def {}({}):\n    return _backend_fn({})\n'.format(
+        fn.__name__, ', '.join(param_names), ', '.join(arg_names)), namespace)
+    adapter = namespace[fn.__name__]
+    adapter.__defaults__ = fn.__defaults__[:-1] if fn.__defaults__ else None
+    adapter.__doc__ = fn.__doc__
+    return adapter
+
+
+def pin(f):
+    """
+    Get a namespace of all templated ivy functions, bound directly to the functions of the given framework.
+
+    Pinned functions skip the framework lookup entirely. Backend functions whose signature matches the ivy signature
+    are returned as-is, and all others are wrapped in a single generated adapter which forwards the arguments in
+    backend order. The namespace is only built once per framework.
+
+    :param f: Machine learning framework to pin.
+    :type f: ml_framework
+    :return: Namespace containing all templated ivy functions, for the pinned framework.
+    """
+    if f in _pinned_namespaces:
+        return _pinned_namespaces[f]
+    namespace = types.ModuleType('{}_pinned'.format(f.__name__))
+    namespace.framework = f
+    for module, name, fn in templated_functions():
+        if hasattr(f, name):
+            setattr(namespace, name, _pinned_function(fn, f))
+    _pinned_namespaces[f] = namespace
+    return namespace
@@ -1,5 +1,6 @@
 import sys
 import ivy
+import jax as _jax
 
 from .core import *
 from . import nn
@@ -7,3 +8,7 @@ from .nn import *
 
 # noinspection PyUnresolvedReferences
 use = ivy.framework_handler.ContextManager(sys.modules[__name__])
+
+# containers are pytrees, so that they can be passed through jax transformations such as jax.jit
+_jax.tree_util.register_pytree_node(ivy.Container, lambda container: container.flatten(),
+                                    lambda treedef, leaves: ivy.Container.unflatten(treedef, leaves))
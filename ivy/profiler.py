@@ -0,0 +1,165 @@
+"""
+Per-function runtime profiler for the templated ivy functions and their framework backends.
+
+Profiling wrappers are only installed between calls to start() and stop(), so there is no cost while disabled.
+"""
+
+# global
+import os
+import csv
+import time
+import functools
+import threading
+import collections
+
+# local
+from ivy import framework_handler as _framework_handler
+
+FWS = ['numpy', 'tensorflow', 'torch', 'jax', 'mxnd']
+
+# (function name, framework name) -> [number of calls, total time, backend time]
+_stats = collections.defaultdict(lambda: [0, 0., 0.])
+_stats_lock = threading.Lock()
+_local = threading.local()
+
+# callables which remove the installed profiling wrappers
+_uninstallers = list()
+
+
+def _state():
+    if not hasattr(_local, 'backend_time'):
+        _local.backend_time = 0.
+        _local.framework_name = None
+    return _local
+
+
+def _profiled_templated_fn(fn):
+
+    @functools.wraps(fn)
+    def profiled(*args, **kwargs):
+        state = _state()
+        outer_backend_time, outer_framework_name = state.backend_time, state.framework_name
+        state.backend_time, state.framework_name = 0., None
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            total_time = time.perf_counter() - start
+            with _stats_lock:
+                entry = _stats[(fn.__name__, state.framework_name)]
+                entry[0] += 1
+                entry[1] += total_time
+                entry[2] += state.backend_time
+            state.backend_time, state.framework_name = outer_backend_time, outer_framework_name
+
+    return profiled
+
+
+def _profiled_backend_fn(fn, framework_name):
+
+    @functools.wraps(fn)
+    def profiled(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            state = _state()
+            state.backend_time += time.perf_counter() - start
+            state.framework_name = framework_name
+
+    return profiled
+
+
+def start():
+    """
+    Start profiling, by wrapping all templated ivy functions, and the functions of all currently imported backends.
+    The wrappers replace the module attributes, so references to ivy functions taken before starting are not profiled.
+    """
+    if _uninstallers:
+        return
+    _uninstallers.append(_framework_handler.install_wrappers(_profiled_templated_fn, _profiled_backend_fn))
+
+
+def stop():
+    """
+    Stop profiling, restoring all original functions. The recorded results are retained.
+    """
+    while _uninstallers:
+        _uninstallers.pop()()
+
+
+def reset():
+    """
+    Clear all recorded results.
+    """
+    with _stats_lock:
+        _stats.clear()
+
+
+class Profile:
+    """
+    Context manager which profiles all ivy calls made inside the context.
+    """
+
+    def __enter__(self):
+        start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        stop()
+
+
+def results():
+    """
+    Get the recorded results, with mean times per call in seconds.
+
+    :return: Dict of function name to dict of framework name to dict of calls, total_time, backend_time and
+             overhead_time.
+    """
+    results_dict = collections.OrderedDict()
+    with _stats_lock:
+        items = sorted(_stats.items(), key=lambda item: (item[0][0], str(item[0][1])))
+    for (fn_name, framework_name), (calls, total_time, backend_time) in items:
+        if framework_name is None:
+            continue
+        if fn_name not in results_dict:
+            results_dict[fn_name] = collections.OrderedDict()
+        results_dict[fn_name][framework_name] = {'calls': calls,
+                                                 'total_time': total_time / calls,
+                                                 'backend_time': backend_time / calls,
+                                                 'overhead_time': max(total_time - backend_time, 0.) / calls}
+    return results_dict
+
+
+def write_csvs(dirpath='csvs'):
+    """
+    Write the recorded results as csv files, one per framework plus one for the mean across frameworks, in the same
+    format as test_runtime/analyse_runtimes.py. Each row contains the method, the ivy overhead, graph construction and
+    backend percentages, an empty column, and then the overhead, graph construction and backend times in milliseconds.
+    Graph construction is always zero, as only eager calls are profiled.
+
+    :param dirpath: Directory to write the csv files to.
+    :type dirpath: str
+    """
+    os.makedirs(dirpath, exist_ok=True)
+    results_dict = results()
+    for fn_name, fn_dict in results_dict.items():
+        times = [fw_dict for fw_name, fw_dict in fn_dict.items() if fw_name in FWS]
+        if not times:
+            continue
+        fn_dict['mean'] = {key: sum([fw_dict[key] for fw_dict in times]) / len(times)
+                           for key in ['total_time', 'backend_time', 'overhead_time']}
+    for key_to_save in FWS + ['mean']:
+        rows = list()
+        for fn_name, fn_dict in results_dict.items():
+            if key_to_save not in fn_dict:
+                continue
+            times = fn_dict[key_to_save]
+            total_time = max(times['total_time'], 1e-12)
+            overhead_ratio = min(max(times['overhead_time'] / total_time, 0), 1)
+            backend_ratio = min(max(times['backend_time'] / total_time, 0), 1)
+            rows.append([fn_name, str(overhead_ratio * 100), str(0.), str(backend_ratio * 100), '',
+                         str(times['overhead_time'] * 1000), str(0.), str(times['backend_time'] * 1000)])
+        rows.sort(key=lambda row: -float(row[1]))
+        with open(os.path.join(dirpath, key_to_save + '_runtime_analysis.csv'), 'w+') as file:
+            csv.writer(file).writerows(rows)
@@ -0,0 +1,174 @@
+"""
+Timeline tracer for ivy calls, exported in the Chrome trace event format, which can be viewed in Perfetto or
+chrome://tracing.
+
+Every templated ivy.core and ivy.neural_net function, the backend functions they dispatch to, all public Container
+methods, and the h5 dataset reads and writes of Container.from_disk and Container.to_disk are recorded as complete
+events with their thread id, so that nesting and concurrent workers are visible. Tracing wrappers are only installed
+between calls to start() and stop(), so there is no cost while disabled.
+"""
+
+# global
+import os
+import json
+import time
+import functools
+import threading
+import collections
+
+# local
+from ivy import framework_handler as _framework_handler
+from ivy.core import container as _container
+from ivy.core import container_io as _container_io
+
+# ring buffer of the (name, category, start time, end time, thread id) of the most recent traced calls
+_events = collections.deque(maxlen=100000)
+_num_dropped = 0
+_thread_names = dict()
+_start_time = time.perf_counter()
+
+# callables which remove the installed tracing wrappers
+_uninstallers = list()
+
+
+def _traced(fn, name, category):
+
+    @functools.wraps(fn)
+    def traced(*args, **kwargs):
+        global _num_dropped
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            tid = threading.get_ident()
+            if tid not in _thread_names:
+                _thread_names[tid] = threading.current_thread().name
+            if len(_events) == _events.maxlen:
+                _num_dropped += 1
+            _events.append((name, category, start, end, tid))
+
+    return traced
+
+
+def _install_container_wrappers():
+    installed = list()
+    for name, attr in list(_container.Container.__dict__.items()):
+        if name[0] == '_':
+            continue
+        if isinstance(attr, staticmethod):
+            new_attr = staticmethod(_traced(attr.__func__, 'Container.' + name, 'ivy.Container'))
+        elif callable(attr):
+            new_attr = _traced(attr, 'Container.' + name, 'ivy.Container')
+        else:
+            continue
+        setattr(_container.Container, name, new_attr)
+        installed.append((_container.Container, name, attr))
+    for name in ['_read_h5_dataset', '_write_h5_dataset']:
+        fn = getattr(_container_io, name)
+        setattr(_container_io, name, _traced(fn, name[1:], 'h5py'))
+        installed.append((_container_io, name, fn))
+
+    def uninstall():
+        for obj, name_, attr_ in reversed(installed):
+            setattr(obj, name_, attr_)
+
+    return uninstall
+
+
+def start(buffer_size=None):
+    """
+    Start tracing, by wrapping all templated ivy functions, the functions of all currently imported backends, the
+    public Container methods and the Container h5 dataset reads and writes. Only the most recent events are retained,
+    with the number of dropped older events reported in the written trace.
+
+    :param buffer_size: Maximum number of events to retain. Retains the current maximum if None.
+    :type buffer_size: int, optional
+    """
+    global _events
+    if buffer_size is not None and buffer_size != _events.maxlen:
+        _events = collections.deque(_events, maxlen=buffer_size)
+    if _uninstallers:
+        return
+    _uninstallers.append(_framework_handler.install_wrappers(
+        lambda fn: _traced(fn, fn.__name__, fn.__module__),
+        lambda fn, framework_name: _traced(fn, getattr(fn, '__name__', str(fn)), 'ivy.' + framework_name)))
+    _uninstallers.append(_install_container_wrappers())
+
+
+def stop():
+    """
+    Stop tracing, restoring all original functions. The recorded events are retained.
+    """
+    while _uninstallers:
+        _uninstallers.pop()()
+
+
+def reset():
+    """
+    Clear all recorded events, and the count of dropped events.
+    """
+    global _num_dropped
+    _events.clear()
+    _num_dropped = 0
+    _thread_names.clear()
+
+
+class Trace:
+    """
+    Context manager which traces all ivy calls made inside the context, and optionally writes the trace on exit.
+
+    :param filepath: Path of the trace file to write on exit. Nothing is written if None.
+    :type filepath: str, optional
+    :param buffer_size: Maximum number of events to retain. Retains the current maximum if None.
+    :type buffer_size: int, optional
+    """
+
+    def __init__(self, filepath=None, buffer_size=None):
+        self._filepath = filepath
+        self._buffer_size = buffer_size
+
+    def __enter__(self):
+        start(self._buffer_size)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        stop()
+        if self._filepath is not None:
+            write(self._filepath)
+
+
+def events():
+    """
+    Get the recorded events in the Chrome trace event format, with times in microseconds.
+
+    :return: List of trace event dicts.
+    """
+    pid = os.getpid()
+    trace_events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}}
+                    for tid, thread_name in list(_thread_names.items())]
+    trace_events += [{'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+                      'ts': (start - _start_time) * 1e6, 'dur': (end - start) * 1e6}
+                     for name, category, start, end, tid in list(_events)]
+    return trace_events
+
+
+def num_dropped():
+    """
+    Get the number of events dropped from the ring buffer since the last reset, because the buffer was full.
+
+    :return: Number of dropped events.
+    """
+    return _num_dropped
+
+
+def write(filepath):
+    """
+    Write the recorded events to a Chrome trace json file, with the number of dropped events in the trace metadata.
+
+    :param filepath: Path of the trace file to write.
+    :type filepath: str
+    """
+    with open(filepath, 'w') as file:
+        json.dump({'traceEvents': events(), 'displayTimeUnit': 'ms',
+                   'otherData': {'dropped_events': _num_dropped, 'buffer_size': _events.maxlen}}, file)
@@ -1,7 +1,68 @@
-import termcolor
+import sys
+import types
+import collections
 
-level = 0
+_level = 0
+
+DispatchEvent = collections.namedtuple('DispatchEvent', ['fn_name', 'framework', 'source'])
+
+# ring buffer of the most recent dispatch events, only written to while tracing is enabled
+events = collections.deque(maxlen=10000)
 
 
 def cprint(message, color='green'):
+    import termcolor
     print(termcolor.colored(message, color))
+
+
+def set_level(new_level, buffer_size=None):
+    """
+    Set the verbosity level. At level 0 the framework dispatch functions are swapped for untraced versions, with no
+    verbosity overhead. At level 1 and above every dispatch is recorded as a DispatchEvent in the events ring buffer,
+    with the source of the chosen framework being one of 'explicit', 'stack' or 'inferred', or 'push' and 'pop' for
+    framework stack changes. At level 2 and above the events are also printed.
+
+    :param new_level: Verbosity level.
+    :type new_level: int
+    :param buffer_size: Maximum number of events to retain. Retains the current maximum if None.
+    :type buffer_size: int, optional
+    """
+    global _level, events
+    _level = new_level
+    if buffer_size is not None and buffer_size != events.maxlen:
+        events = collections.deque(events, maxlen=buffer_size)
+    from ivy import framework_handler
+    framework_handler._install_dispatch(traced=_level > 0)
+
+
+def record(fn_name, framework, source):
+    """
+    Record a dispatch event in the events ring buffer.
+
+    :param fn_name: Name of the function which requested the framework.
+    :type fn_name: str
+    :param framework: The framework which was selected.
+    :type framework: ml_framework
+    :param source: How the framework was selected.
+    :type source: str
+    """
+    event = DispatchEvent(fn_name, framework, source)
+    events.append(event)
+    if _level > 1:
+        cprint('{}: {} from {}'.format(fn_name, getattr(framework, '__name__', framework), source))
+
+
+class _VerbosityModule(types.ModuleType):
+
+    # assigning the level directly, as in ivy.verbosity.level = 1, goes through set_level, so that the matching
+    # dispatch functions are installed
+    @property
+    def level(self):
+        return _level
+
+    @level.setter
+    def level(self, new_level):
+        set_level(new_level)
+
+
+sys.modules[__name__].__class__ = _VerbosityModule
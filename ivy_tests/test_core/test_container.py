@@ -1,12 +1,15 @@
 # global
 import os
+import pickle
+import h5py
 import random
 
 # local
-from ivy.core.container import Container
+from ivy.core.container import Container, PackedContainer
 import ivy_tests.helpers as helpers
 import numpy as np
 import ivy
+import ivy.tracer
 
 from ivy_tests.helpers import mx_sym_to_val as func
 
@@ -28,6 +31,154 @@ def test_container_from_dict():
         assert fn(container.b.d) == fn(ivy.array([3], f=lib))
 
 
+def test_container_key_chain_access():
+    for lib, call in helpers.calls:
+        dict_in = {'a': ivy.array([1], f=lib),
+                   'b': {'c': ivy.array([2], f=lib), 'd': {'e': ivy.array([3], f=lib)}}}
+        container = Container(dict_in)
+        assert container['b/c'] is container.b.c
+        assert container['b/d/e'] is container.b.d.e
+        assert container['b/d'] is container.b.d
+        assert [key for key, _ in container.to_iterator()] == ['a', 'c', 'e']
+
+        # the flat index is rebuilt after mutating any nested container
+        new_value = ivy.array([4], f=lib)
+        container.b.d['e'] = new_value
+        assert container['b/d/e'] is new_value
+        container.b['f'] = new_value
+        assert container['b/f'] is new_value
+        assert len(container.to_flat_list()) == 4
+        del container.b['c']
+        try:
+            _ = container['b/c']
+            assert False
+        except KeyError:
+            pass
+        assert len(container.to_flat_list()) == 3
+
+        # empty sub-containers are kept by map, as new containers
+        container = Container({'a': ivy.array([1], f=lib), 'b': {}})
+        for parallel in [False, True]:
+            mapped = container.map(lambda x, _: x, parallel=parallel)
+            assert mapped.b == Container() and mapped.b is not container.b
+            mapped.b['c'] = new_value
+            assert container.b == Container()
+
+        # keys are kept as they are, rather than joined into key chains and split again
+        assert len(Container({1: ivy.array([1], f=lib), 2: ivy.array([2], f=lib)}).to_flat_list()) == 2
+        container = Container({'a/b': ivy.array([1], f=lib)})
+        mapped = container.map(lambda x, kc: kc)
+        assert list(mapped.keys()) == ['a/b'] and mapped['a/b'] == '/a/b'
+
+        # an index built while a mutation is in progress is discarded once the mutation completes
+        container = Container({'a': ivy.array([1], f=lib)})
+        dict.__setitem__(container, 'b', new_value)
+        assert len(container.to_flat_list()) == 2
+        dict.__delitem__(container, 'b')
+        container._mutated()
+        assert len(container.to_flat_list()) == 1
+
+        # mutating one container keeps the cached indices of unrelated containers
+        other = Container({'a': ivy.array([1], f=lib)})
+        entries = other._flat_index()[0]
+        container['c'] = new_value
+        assert other._flat_index()[0] is entries
+
+        # a sub-container held by several containers invalidates the indices of all of them
+        shared = Container({'c': ivy.array([1], f=lib)})
+        first, second = Container(), Container()
+        first['a'] = shared
+        second['b'] = shared
+        assert first['a/c'] is shared.c and second['b/c'] is shared.c
+        shared['d'] = new_value
+        assert first['a/d'] is new_value and second['b/d'] is new_value
+
+    # the cached indices and parent links are not pickled
+    container = Container({'a': {'b': np.array([1])}})
+    assert container['a/b'] is container.a.b
+    restored = pickle.loads(pickle.dumps(container))
+    assert '_flat' not in restored.__dict__ and '_parents' not in restored.a.__dict__
+    restored.a['c'] = np.array([2])
+    assert restored['a/c'] is restored.a.c and 'a/c' not in container._flat_index()[1]
+
+
+def test_container_flatten_and_unflatten():
+    for lib, call in helpers.calls:
+        dict_in = {'b': {'d': ivy.array([3], f=lib), 'c': ivy.array([2], f=lib)}, 'a': ivy.array([1], f=lib),
+                   'e': {}}
+        container = Container(dict_in)
+        leaves, treedef = container.flatten()
+        assert leaves == [container.a, container.b.c, container.b.d]
+
+        # the tree structure is cached, and equal for containers with the same structure
+        assert container.flatten()[1] is treedef
+        other_treedef = Container(dict_in).flatten()[1]
+        assert other_treedef == treedef and hash(other_treedef) == hash(treedef)
+        assert {treedef: 0}[other_treedef] == 0
+
+        new_leaves = [ivy.array([4], f=lib), ivy.array([5], f=lib), ivy.array([6], f=lib)]
+        new_container = Container.unflatten(treedef, new_leaves)
+        assert new_container.a is new_leaves[0]
+        assert new_container.b.c is new_leaves[1]
+        assert new_container.b.d is new_leaves[2]
+        assert new_container.e == Container()
+        assert new_container.flatten()[1] == treedef
+
+        # mutation invalidates the cached structure
+        container.b['f'] = ivy.array([7], f=lib)
+        leaves, new_treedef = container.flatten()
+        assert len(leaves) == 4 and new_treedef != treedef
+
+        if call is helpers.jnp_call:
+            import jax
+            doubled = jax.jit(lambda c: c.map(lambda x, _: x * 2))(container)
+            assert isinstance(doubled, Container)
+            assert np.array_equal(np.asarray(doubled.b.f), np.array([14]))
+
+
+def test_container_pack_and_unpack():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # the buffer offsets are computed from the static shapes
+            continue
+        dict_in = {'a': ivy.array([[1., 2.], [3., 4.]], 'float32', f=lib),
+                   'b': {'c': ivy.array([5., 6., 7.], 'float32', f=lib), 'd': ivy.array([1, 2], 'int32', f=lib), 'e': 'string'}}
+        container = Container(dict_in)
+        packed = container.pack()
+        assert isinstance(packed, PackedContainer)
+        assert set(packed.buffers.keys()) == {'float32', 'int32'}
+        assert np.array_equal(ivy.to_numpy(packed.buffers['float32'], lib), np.array([1., 2., 3., 4., 5., 6., 7.]))
+        assert np.array_equal(ivy.to_numpy(packed.a, lib), np.array([[1., 2.], [3., 4.]]))
+        assert np.array_equal(ivy.to_numpy(packed['b/c'], lib), np.array([5., 6., 7.]))
+        assert np.array_equal(ivy.to_numpy(packed.b.d, lib), np.array([1, 2]))
+        assert packed.b.e == 'string'
+
+        doubled = packed.map_buffers(lambda buffer, _: buffer * 2)
+        assert np.array_equal(ivy.to_numpy(doubled.b.c, lib), np.array([10., 12., 14.]))
+        assert np.array_equal(ivy.to_numpy(doubled.b.d, lib), np.array([2, 4]))
+        recreated = PackedContainer(doubled.buffers, doubled.index)
+        assert np.array_equal(ivy.to_numpy(recreated.a, lib), np.array([[2., 4.], [6., 8.]]))
+
+        unpacked = doubled.unpack()
+        assert type(unpacked) is Container
+        assert unpacked.flatten()[1] == container.flatten()[1]
+        assert np.array_equal(ivy.to_numpy(unpacked.a, lib), np.array([[2., 4.], [6., 8.]]))
+
+    # numpy entries are views into the buffers
+    packed = Container({'a': np.ones((2, 3), np.float32), 'b': np.zeros((4,), np.float32)}).pack()
+    packed.buffers['float32'][...] = 3.
+    assert np.array_equal(packed.a, np.full((2, 3), 3.))
+    assert np.array_equal(packed.b, np.full((4,), 3.))
+
+    # the entry views are created with the templated reshape, so wrappers such as the tracer apply
+    ivy.tracer.reset()
+    with ivy.tracer.Trace():
+        PackedContainer(packed.buffers, packed.index)
+    assert len([event for event in ivy.tracer.events() if event['name'] == 'reshape' and
+                event['cat'] == 'ivy.core.general']) == 2
+    ivy.tracer.reset()
+
+
 def test_container_expand_dims():
     for lib, call in helpers.calls:
         if call is helpers.mx_graph_call:
@@ -46,6 +197,35 @@ def test_container_expand_dims():
         assert (fn(container_expanded_dims.b.d) == fn(ivy.array([[3]], f=lib)))[0, 0]
 
 
+def test_container_unstack():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # the splits are checked against the static dimension size
+            continue
+        dict_in = {'a': ivy.array([[1, 2, 3], [4, 5, 6]], f=lib),
+                   'b': {'c': ivy.array([[7, 8, 9], [10, 11, 12]], f=lib), 'd': 'string'}}
+        container = Container(dict_in)
+        for dim, dim_size in [(0, 2), (1, 3)]:
+            unstacked = container.unstack(dim, dim_size)
+            unstacked_iterated = list(container.unstack_iterator(dim, dim_size))
+            assert len(unstacked) == len(unstacked_iterated) == dim_size
+            for i, (cont, cont_iterated) in enumerate(zip(unstacked, unstacked_iterated)):
+                expected_a = np.take(np.array([[1, 2, 3], [4, 5, 6]]), [i], dim)
+                expected_c = np.take(np.array([[7, 8, 9], [10, 11, 12]]), [i], dim)
+                for c in [cont, cont_iterated]:
+                    assert np.array_equal(ivy.to_numpy(c.a, lib), expected_a)
+                    assert np.array_equal(ivy.to_numpy(c.b.c, lib), expected_c)
+                    assert c.b.d == 'string'
+
+    # numpy entries are unstacked into views, which alias the input as np.split does
+    x = np.arange(6).reshape((2, 3))
+    unstacked = Container({'a': x}).unstack(-1, 3)
+    assert [cont.a.shape for cont in unstacked] == [(2, 1)] * 3
+    assert all(np.shares_memory(cont.a, x) for cont in unstacked)
+    x[0, 1] = 10
+    assert np.array_equal(unstacked[1].a, np.array([[10], [4]]))
+
+
 def test_container_prune_key_chain():
     for lib, call in helpers.calls:
         if call is helpers.mx_graph_call:
@@ -114,27 +294,30 @@ def test_container_prune_empty():
 
 def test_container_shuffle():
     for lib, call in helpers.calls:
-        if call is helpers.tf_graph_call:
-            # tf.random.set_seed is not compiled. The shuffle is then not aligned between container items.
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # the shuffle reads the static leading dimension of each array
             continue
-        if call is helpers.mx_graph_call:
-            fn = func
-        else:
-            fn = lambda x: x
-        dict_in = {'a': ivy.array([1, 2, 3], f=lib),
-                   'b': {'c': ivy.array([1, 2, 3], f=lib), 'd': ivy.array([1, 2, 3], f=lib)}}
+        dict_in = {'a': ivy.array([1, 2, 3, 4, 5], f=lib),
+                   'b': {'c': ivy.array([1, 2, 3, 4, 5], f=lib), 'd': ivy.array([[1, 1], [2, 2], [3, 3], [4, 4], [5, 5]],
+                                                                                f=lib)}}
         container = Container(dict_in)
         container_shuffled = container.shuffle(0)
-        data = ivy.array([1, 2, 3], f=lib)
-        ivy.core.random.seed(f=lib)
-        shuffled_data = ivy.core.random.shuffle(data)
+        shuffled_data = ivy.to_numpy(container_shuffled.a, lib)
+
+        assert np.array_equal(shuffled_data, np.array([1, 2, 3, 4, 5])[np.random.RandomState(0).permutation(5)])
+        assert np.array_equal(ivy.to_numpy(container_shuffled['a'], lib), shuffled_data)
+        assert np.array_equal(ivy.to_numpy(container_shuffled['b']['c'], lib), shuffled_data)
+        assert np.array_equal(ivy.to_numpy(container_shuffled.b.d, lib), np.stack([shuffled_data] * 2, -1))
+        assert np.array_equal(ivy.to_numpy(container.shuffle(0).a, lib), shuffled_data)
 
-        assert np.array(fn(container_shuffled['a']) == fn(shuffled_data)).all()
-        assert np.array(fn(container_shuffled.a) == fn(shuffled_data)).all()
-        assert np.array(fn(container_shuffled['b']['c']) == fn(shuffled_data)).all()
-        assert np.array(fn(container_shuffled.b.c) == fn(shuffled_data)).all()
-        assert np.array(fn(container_shuffled['b']['d']) == fn(shuffled_data)).all()
-        assert np.array(fn(container_shuffled.b.d) == fn(shuffled_data)).all()
+    # numpy in place
+    data = np.arange(5)
+    container = Container({'a': data, 'b': {'c': data.copy()}})
+    container_shuffled = container.shuffle(0)
+    assert container.shuffle(0, in_place=True) is not None
+    assert np.array_equal(container.a, container_shuffled.a)
+    assert np.array_equal(container.b.c, container_shuffled.b.c)
+    assert np.array_equal(data, container_shuffled.a)
 
 
 def test_container_to_iterator():
@@ -163,6 +346,53 @@ def test_container_map():
             assert call(lambda x: x, value) == call(lambda x: x, expected_value)
 
 
+def _add_one_with_key_chain(x, key_chain):
+    return x + 1, key_chain
+
+
+def _zeros_with_set_framework(x, key_chain):
+    return ivy.zeros((2,))
+
+
+def test_container_parallel_map():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # the worker threads do not share the graph context
+            continue
+        dict_in = {'a': ivy.array([1], f=lib),
+                   'b': {'c': ivy.array([2], f=lib), 'd': ivy.array([3], f=lib)}}
+        container = Container(dict_in)
+        for max_workers in [None, 1, 3]:
+            mapped = container.map(lambda x, kc: (ivy.to_numpy(x + 1, lib), kc), parallel=True,
+                                   max_workers=max_workers)
+            assert [key_chain for _, key_chain in mapped.to_flat_list()] == ['/a', '/b/c', '/b/d']
+            assert [value[0] for value, _ in mapped.to_flat_list()] == [2, 3, 4]
+
+        # nested parallel maps run sequentially inside the workers
+        nested = Container({'x': container, 'y': container}).map(
+            lambda x, _: x + container.map(lambda y, __: y, parallel=True, max_workers=1).a, parallel=True,
+            max_workers=1)
+        assert [ivy.to_numpy(value, lib)[0] for value in nested.to_flat_list()] == [2, 3, 4, 2, 3, 4]
+
+        # the framework set by the caller is used inside the workers
+        with lib.use:
+            zeros = container.map(lambda x, _: ivy.zeros((2,)), parallel=True)
+        assert [ivy.to_numpy(value, lib).tolist() for value in zeros.to_flat_list()] == [[0., 0.]] * 3
+
+    # only the pools of the default size are kept, with pools of a requested size shut down after each call
+    assert set(ivy.core.container._map_executors.keys()) <= {False, True}
+
+    # process pool
+    container = Container({'a': np.array([1]), 'b': {'c': np.array([2]), 'd': np.array([3])}})
+    mapped = container.map(_add_one_with_key_chain, parallel=True, max_workers=2, processes=True)
+    assert [key_chain for _, key_chain in mapped.to_flat_list()] == ['/a', '/b/c', '/b/d']
+    assert [value[0] for value, _ in mapped.to_flat_list()] == [2, 3, 4]
+    with ivy.numpy.use:
+        zeros = container.map(_zeros_with_set_framework, parallel=True, processes=True)
+    assert [value.tolist() for value in zeros.to_flat_list()] == [[0., 0.]] * 3
+    assert set(ivy.core.container._map_executors.keys()) <= {False, True}
+
+
 def test_container_to_random():
     for lib, call in helpers.calls:
         dict_in = {'a': ivy.array([1.], f=lib),
@@ -254,6 +484,240 @@ def test_container_to_and_from_disk():
         os.remove(save_filepath)
 
 
+def test_container_h5_metadata():
+    save_filepath = 'container_on_disk.hdf5'
+    container = Container({'a': np.zeros((4, 3), np.float32),
+                           'b': {'c': np.zeros((4,), np.int64), 'd': np.zeros((4, 2, 2), np.float64)}})
+    container.to_disk(save_filepath, max_batch_size=4, chunks=2)
+    metadata = Container.h5_metadata(save_filepath)
+    assert list(metadata.datasets.keys()) == ['a', 'b/c', 'b/d']
+    assert metadata.groups == ['b']
+    assert metadata.datasets['a'].shape == (4, 3)
+    assert metadata.datasets['b/c'].dtype == np.int64
+    assert metadata.datasets['b/d'].nbytes == 4 * 2 * 2 * 8
+    assert metadata.datasets['b/d'].batch_size == 4
+    assert metadata.datasets['b/d'].chunks == (2, 2, 2)
+    assert metadata.size == 4 * 3 * 4 + 4 * 8 + 4 * 2 * 2 * 8
+    assert metadata.batch_size == 4
+    assert Container.h5_metadata(save_filepath) is metadata
+    assert Container.h5_file_size(save_filepath) == (metadata.size, 4)
+
+    # the file is closed after indexing, so it can be rewritten, which invalidates the cached index
+    Container({'a': np.zeros((6,), np.float32)}).to_disk(save_filepath, mode='w')
+    metadata = Container.h5_metadata(save_filepath)
+    assert list(metadata.datasets.keys()) == ['a']
+    assert metadata.datasets['a'].shape == (6,)
+    assert Container.h5_file_size(save_filepath) == (6 * 4, 6)
+    os.remove(save_filepath)
+
+
+def test_container_from_disk_into_out():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # container disk saving requires eager execution
+            continue
+        save_filepath = 'container_on_disk.hdf5'
+        dict_in = {'a': ivy.array([np.float32(1.), np.float32(2.)], f=lib),
+                   'b': {'c': ivy.array([[np.float32(3.)], [np.float32(4.)]], f=lib)}}
+        container = Container(dict_in)
+        container.to_disk(save_filepath, max_batch_size=2)
+
+        out = Container({'a': np.zeros((1,), np.float32), 'b': {'c': np.zeros((1, 1), np.float32)}})
+        loaded_container = Container.from_disk(save_filepath, lib, slice(1, 2), out=out)
+        assert np.array_equal(out.a, np.array([2.], np.float32))
+        assert np.array_equal(out.b.c, np.array([[4.]], np.float32))
+        assert np.array_equal(loaded_container.a, np.array([2.], np.float32))
+        assert np.array_equal(loaded_container.b.c, np.array([[4.]], np.float32))
+
+        os.remove(save_filepath)
+
+
+def test_lazy_container_from_disk():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # container disk loading requires eager execution
+            continue
+        save_filepath = 'container_on_disk.hdf5'
+        data = np.arange(20 * 2, dtype=np.float32).reshape((20, 2))
+        Container({'a': data, 'b': {'c': data[:, 0]}}).to_disk(save_filepath)
+
+        # chunked datasets, read through the chunk cache
+        lazy_container = Container.from_disk(save_filepath, lib, lazy=True)
+        assert isinstance(lazy_container, ivy.LazyContainer)
+        assert lazy_container.size == 20
+        sliced = lazy_container.slice(slice(5, 15)).slice(slice(None, None, 3))
+        assert isinstance(sliced, ivy.LazyContainer)
+        assert sliced.size == 4
+        assert np.array_equal(ivy.to_numpy(sliced.a, lib), data[5:15][::3])
+        assert np.array_equal(ivy.to_numpy(sliced['b/c'], lib), data[5:15][::3, 0])
+        assert np.array_equal(ivy.to_numpy(lazy_container.slice((slice(None, None, -1), slice(1, 2)))['a'], lib),
+                              data[::-1, 1:2])
+        eager_container = Container(sliced)
+        assert not isinstance(eager_container, ivy.LazyContainer)
+        assert np.array_equal(ivy.to_numpy(eager_container.b.c, lib), data[5:15][::3, 0])
+
+        # closing any view or sub-container closes the file, which can then be truncated again
+        sliced.b.close()
+        with h5py.File(save_filepath, 'r+'):
+            pass
+        lazy_container.close()
+
+        # only the accessed rows are read, and repeated reads hit the chunk cache
+        read_slices = list()
+        read_h5_dataset = ivy.core.container_io._read_h5_dataset
+        ivy.core.container_io._read_h5_dataset = lambda dataset, slice_obj, out=None: \
+            read_slices.append(slice_obj) or read_h5_dataset(dataset, slice_obj, out)
+        try:
+            lazy_container = Container.from_disk(save_filepath, lib, slice(2, 4), lazy=True)
+            assert read_slices == []
+            lazy_container.a
+            lazy_container.a
+            assert len(read_slices) == 1
+        finally:
+            ivy.core.container_io._read_h5_dataset = read_h5_dataset
+        lazy_container.close()
+        with h5py.File(save_filepath, 'w'):
+            pass
+        os.remove(save_filepath)
+
+        # contiguous datasets, read through a memory map
+        with h5py.File(save_filepath, 'w') as h5_file:
+            h5_file.create_dataset('a', data=data)
+        lazy_container = Container.from_disk(save_filepath, lib, lazy=True)
+        assert np.array_equal(ivy.to_numpy(lazy_container.slice(slice(3, 7)).a, lib), data[3:7])
+        lazy_container.close()
+        os.remove(save_filepath)
+
+
+def test_container_batches_from_disk():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # container disk loading requires eager execution
+            continue
+        save_filepath = 'container_on_disk.hdf5'
+        data = np.arange(10 * 2, dtype=np.float32).reshape((10, 2))
+        Container({'a': data, 'b': {'c': data[:, 0]}}).to_disk(save_filepath)
+
+        # in order
+        batches = list(Container.batches_from_disk(save_filepath, lib, 4))
+        assert [batch.size for batch in batches] == [4, 4, 2]
+        assert np.array_equal(np.concatenate([ivy.to_numpy(batch.a, lib) for batch in batches]), data)
+        assert np.array_equal(np.concatenate([ivy.to_numpy(batch.b.c, lib) for batch in batches]), data[:, 0])
+
+        # shuffled, dropping the last batch
+        with Container.batches_from_disk(save_filepath, lib, 4, shuffle=True, seed_value=0,
+                                         drop_last=True) as batch_iterator:
+            assert len(batch_iterator) == 2
+            batches = list(batch_iterator)
+        assert [batch.size for batch in batches] == [4, 4]
+        a = np.concatenate([ivy.to_numpy(batch.a, lib) for batch in batches])
+        c = np.concatenate([ivy.to_numpy(batch.b.c, lib) for batch in batches])
+        assert np.array_equal(a[:, 0], c)
+        assert not np.array_equal(a, data[:8])
+        assert len(np.unique(a[:, 0])) == 8
+
+        # closing early
+        batch_iterator = Container.batches_from_disk(save_filepath, lib, 1, num_prefetch=1)
+        next(batch_iterator)
+        batch_iterator.close()
+        assert not batch_iterator._thread.is_alive()
+
+        # dropping early, without closing
+        batch_iterator = Container.batches_from_disk(save_filepath, lib, 1, num_prefetch=1)
+        next(batch_iterator)
+        thread = batch_iterator._thread
+        del batch_iterator
+        thread.join(5)
+        assert not thread.is_alive()
+        with h5py.File(save_filepath, 'w'):
+            pass
+        os.remove(save_filepath)
+
+
+def _loader_batch_fn(batch_idx):
+    return Container({'a': np.full((2, 3), batch_idx, np.float32),
+                      'b': {'c': np.arange(batch_idx + 1), 'd': 'batch {}'.format(batch_idx)}})
+
+
+def test_multiprocess_loader():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # the loader returns eager arrays
+            continue
+        with ivy.MultiprocessLoader(_loader_batch_fn, 5, f=lib, num_workers=2, num_prefetch=1) as loader:
+            batches = list(loader)
+        assert len(batches) == 5
+        for batch_idx, batch in enumerate(batches):
+            assert np.array_equal(ivy.to_numpy(batch.a, lib), np.full((2, 3), batch_idx, np.float32))
+            assert np.array_equal(ivy.to_numpy(batch.b.c, lib), np.arange(batch_idx + 1))
+            assert batch.b.d == 'batch {}'.format(batch_idx)
+
+
+def test_container_writer():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # container disk saving requires eager execution
+            continue
+        save_filepath = 'container_on_disk.hdf5'
+        data = np.arange(10 * 2, dtype=np.float32).reshape((10, 2))
+        for chunks, compression, buffer_size in [(True, None, 1), (4, 'gzip', 3), (2, 'lzf', 2)]:
+            with ivy.ContainerWriter(save_filepath, chunks=chunks, compression=compression,
+                                     buffer_size=buffer_size) as writer:
+                for batch_start in range(0, 6, 2):
+                    writer.append(Container({'a': ivy.array(data[batch_start:batch_start + 2], f=lib),
+                                             'b': {'c': ivy.array(data[batch_start:batch_start + 2, 0], f=lib)}}))
+
+            # appending after the existing entries, after reopening
+            with ivy.ContainerWriter(save_filepath, buffer_size=buffer_size) as writer:
+                writer.append(Container({'a': data[6:], 'b': {'c': data[6:, 0]}}))
+
+            with h5py.File(save_filepath, 'r') as h5_file:
+                assert h5_file['a'].compression == compression
+                if isinstance(chunks, int) and not isinstance(chunks, bool):
+                    assert h5_file['a'].chunks == (chunks, 2)
+            loaded_container = Container.from_disk(save_filepath, lib)
+            assert np.array_equal(ivy.to_numpy(loaded_container.a, lib), data)
+            assert np.array_equal(ivy.to_numpy(loaded_container.b.c, lib), data[:, 0])
+            os.remove(save_filepath)
+
+        # to_disk with compression
+        Container({'a': data}).to_disk(save_filepath, chunks=5, compression='gzip', compression_opts=4)
+        with h5py.File(save_filepath, 'r') as h5_file:
+            assert h5_file['a'].compression == 'gzip'
+            assert h5_file['a'].chunks == (5, 2)
+            assert np.array_equal(h5_file['a'][()], data)
+        os.remove(save_filepath)
+
+
+def test_async_container_writer():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # container disk saving requires eager execution
+            continue
+        save_filepath = 'container_on_disk.hdf5'
+        for buffer_size, max_queue_size in [(1, 2), (3, 1)]:
+            source = Container({'a': np.zeros((2, 3), np.float32), 'b': {'c': np.zeros((2,), np.int64)}})
+            with ivy.AsyncContainerWriter(save_filepath, buffer_size=buffer_size,
+                                          max_queue_size=max_queue_size) as writer:
+                for batch_idx in range(10):
+                    source.a[...] = batch_idx
+                    source.b.c[...] = batch_idx
+                    writer.append(source)
+                    # mutating the source straight after appending does not affect what is written
+                    source.a[...] = -1
+                    source.b.c[...] = -1
+                    if batch_idx == 4:
+                        writer.flush()
+                        with h5py.File(save_filepath, 'r') as h5_file:
+                            assert h5_file['a'].shape[0] == 10
+
+            loaded_container = Container.from_disk(save_filepath, lib)
+            expected = np.repeat(np.arange(10), 2)
+            assert np.array_equal(ivy.to_numpy(loaded_container.a, lib)[:, 0], expected.astype(np.float32))
+            assert np.array_equal(ivy.to_numpy(loaded_container.b.c, lib), expected)
+            os.remove(save_filepath)
+
+
 def test_container_to_disk_shuffle_and_from_disk():
     for lib, call in helpers.calls:
         if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
@@ -275,9 +739,7 @@ def test_container_to_disk_shuffle_and_from_disk():
         container_shuffled = Container.from_disk(save_filepath, lib, slice(3))
 
         # testing
-        data = np.array([1, 2, 3])
-        random.seed(0)
-        random.shuffle(data)
+        data = np.array([1, 2, 3])[np.random.RandomState(0).permutation(3)]
 
         assert (ivy.to_numpy(container_shuffled['a'], lib) == data).all()
         assert (ivy.to_numpy(container_shuffled.a, lib) == data).all()
@@ -287,3 +749,97 @@ def test_container_to_disk_shuffle_and_from_disk():
         assert (ivy.to_numpy(container_shuffled.b.d, lib) == data).all()
 
         os.remove(save_filepath)
+
+
+def test_container_incremental_to_disk():
+    save_filepath = 'container_on_disk.hdf5'
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # container disk saving requires eager execution
+            continue
+        container = Container({'a': ivy.array([1, 2, 3], f=lib),
+                               'b': {'c': ivy.array([4, 5, 6], f=lib), 'd': ivy.array([7, 8, 9], f=lib)}})
+        container.to_disk(save_filepath, incremental=True)
+
+        written = list()
+        write_h5_dataset = ivy.core.container_io._write_h5_dataset
+        ivy.core.container_io._write_h5_dataset = lambda dataset, *args: \
+            written.append(dataset.name) or write_h5_dataset(dataset, *args)
+        try:
+            container.to_disk(save_filepath, incremental=True)
+            assert written == []
+            container['b']['c'] = ivy.array([0, 0, 0], f=lib)
+            container.to_disk(save_filepath, incremental=True)
+            assert written == ['/b/c']
+        finally:
+            ivy.core.container_io._write_h5_dataset = write_h5_dataset
+
+        loaded = Container.from_disk(save_filepath, lib)
+        assert np.array_equal(ivy.to_numpy(loaded.a, lib), np.array([1, 2, 3]))
+        assert np.array_equal(ivy.to_numpy(loaded.b.c, lib), np.array([0, 0, 0]))
+        assert np.array_equal(ivy.to_numpy(loaded.b.d, lib), np.array([7, 8, 9]))
+
+        # other writes remove the stored hashes, so the next incremental save rewrites the entries
+        Container.shuffle_h5_file(save_filepath)
+        container.to_disk(save_filepath, incremental=True)
+        loaded = Container.from_disk(save_filepath, lib)
+        assert np.array_equal(ivy.to_numpy(loaded.a, lib), np.array([1, 2, 3]))
+        assert np.array_equal(ivy.to_numpy(loaded.b.d, lib), np.array([7, 8, 9]))
+
+        # plain saves and writers remove the stored hashes of the datasets they open
+        container.to_disk(save_filepath)
+        with h5py.File(save_filepath, 'r') as h5_obj:
+            assert 'ivy_incremental_hash' not in h5_obj['a'].attrs
+        container.to_disk(save_filepath, incremental=True)
+        with h5py.File(save_filepath, 'r') as h5_obj:
+            assert 'ivy_incremental_hash' in h5_obj['a'].attrs
+        with ivy.ContainerWriter(save_filepath, starting_index=0) as writer:
+            writer.append(container)
+        with h5py.File(save_filepath, 'r') as h5_obj:
+            assert 'ivy_incremental_hash' not in h5_obj['a'].attrs
+        os.remove(save_filepath)
+
+
+def test_container_save_and_load():
+    save_filepath = 'container_saved.bin'
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            # container saving requires eager execution
+            continue
+        dict_in = {'a': ivy.array([[1., 2.], [3., 4.]], 'float32', f=lib),
+                   'b': {'c': ivy.array([5, 6, 7], 'int32', f=lib), 'd': ivy.array([1., 2.], 'float32', f=lib)}}
+        container = Container(dict_in)
+        for format in ['raw', 'npz']:
+            container.save(save_filepath, format)
+            for mmap in [True, False]:
+                for loaded_f in [None, lib]:
+                    loaded = Container.load(save_filepath, loaded_f, mmap=mmap)
+                    assert np.array_equal(ivy.to_numpy(loaded.a, lib) if loaded_f else loaded.a,
+                                          np.array([[1., 2.], [3., 4.]], np.float32))
+                    assert np.array_equal(ivy.to_numpy(loaded.b.c, lib) if loaded_f else loaded.b.c,
+                                          np.array([5, 6, 7], np.int32))
+                    assert np.array_equal(ivy.to_numpy(loaded['b/d'], lib) if loaded_f else loaded['b/d'],
+                                          np.array([1., 2.], np.float32))
+                    if loaded_f is None:
+                        assert loaded.a.dtype == np.float32 and loaded.b.c.dtype == np.int32
+                        assert isinstance(loaded.a, np.memmap) is (format == 'raw' and mmap)
+            os.remove(save_filepath)
+
+
+def test_container_shuffle_h5_file_out_of_core():
+    save_filepath = 'container_on_disk.hdf5'
+    data = np.arange(100 * 3, dtype=np.float32).reshape((100, 3))
+    for memory_budget in [int(2**28), 10 * 3 * 4, 1]:
+        container = Container({'a': data, 'b': {'c': data[:, 0]}})
+        container.to_disk(save_filepath, max_batch_size=100)
+        random_state = random.getstate()
+        rows_per_second = Container.shuffle_h5_file(save_filepath, seed_value=1, memory_budget=memory_budget)
+        assert rows_per_second > 0
+        assert random.getstate() == random_state
+        container_shuffled = Container.from_disk(save_filepath, ivy.numpy)
+
+        indices = np.random.RandomState(1).permutation(100)
+        assert np.array_equal(container_shuffled.a, data[indices])
+        assert np.array_equal(container_shuffled.a, container.shuffle(1).a)
+        assert np.array_equal(container_shuffled.b.c, data[indices, 0])
+        os.remove(save_filepath)
@@ -0,0 +1,145 @@
+"""
+Collection of tests for the framework handler
+"""
+
+# global
+import asyncio
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# local
+import ivy
+import ivy.framework_handler as framework_handler
+import ivy_tests.helpers as helpers
+
+
+def _eager_libs():
+    return [lib for lib, call in helpers.calls if call not in [helpers.tf_graph_call, helpers.mx_graph_call]]
+
+
+def test_set_and_unset_framework():
+    for lib in _eager_libs():
+        assert framework_handler.framework_stack == ()
+        framework_handler.set_framework(lib)
+        assert framework_handler.framework_stack == (lib,)
+        assert framework_handler.get_framework() is lib
+        framework_handler.unset_framework()
+        assert framework_handler.framework_stack == ()
+        with lib.use:
+            assert framework_handler.get_framework() is lib
+        assert framework_handler.framework_stack == ()
+
+
+def test_framework_stack_is_read_only():
+    for lib in _eager_libs():
+        with lib.use:
+            framework_stack = framework_handler.framework_stack
+            assert framework_stack == (lib,)
+            for mutate in [lambda: framework_stack.append(lib), lambda: framework_stack.pop()]:
+                try:
+                    mutate()
+                    raised = False
+                except AttributeError:
+                    raised = True
+                assert raised
+            assert framework_handler.framework_stack == (lib,)
+
+
+def test_framework_stack_is_thread_local():
+    libs = _eager_libs()
+    barrier = threading.Barrier(len(libs))
+
+    def _set_and_check(lib):
+        framework_handler.set_framework(lib)
+        barrier.wait()
+        f = framework_handler.get_framework()
+        framework_handler.unset_framework()
+        return f
+
+    with ThreadPoolExecutor(len(libs)) as executor:
+        results = list(executor.map(_set_and_check, libs))
+    assert results == libs
+    assert framework_handler.framework_stack == ()
+
+
+def test_framework_stack_is_task_local():
+    libs = _eager_libs()
+
+    async def _set_and_check(lib):
+        with lib.use:
+            await asyncio.sleep(0)
+            return framework_handler.get_framework()
+
+    async def _main():
+        return await asyncio.gather(*[_set_and_check(lib) for lib in libs])
+
+    assert asyncio.run(_main()) == libs
+
+
+def test_mixed_framework_stress():
+    libs = _eager_libs()
+    num_threads = 16
+    num_iters = 200
+
+    def _worker(thread_idx):
+        for i in range(num_iters):
+            lib = libs[(thread_idx + i) % len(libs)]
+            with lib.use:
+                x = ivy.array([float(i), 1.])
+                assert framework_handler._get_framework_from_args([x]) is lib
+                y = ivy.to_numpy(ivy.reduce_sum(x))
+            assert np.allclose(y, i + 1.)
+        return True
+
+    with ThreadPoolExecutor(num_threads) as executor:
+        assert all(executor.map(_worker, range(num_threads)))
+    assert framework_handler.framework_stack == ()
+
+
+def test_pin():
+    for lib in _eager_libs():
+        pinned = ivy.pin(lib)
+        assert pinned is ivy.pin(lib)
+        x = ivy.array([1., 2., 3.], f=lib)
+        assert np.allclose(ivy.to_numpy(pinned.reduce_sum(x), lib), 6.)
+        assert np.allclose(ivy.to_numpy(pinned.minimum(x, 2.), lib), [1., 2., 2.])
+        assert np.allclose(ivy.to_numpy(pinned.clip(x, x_min=1.5, x_max=2.5), lib), [1.5, 2., 2.5])
+        assert tuple(pinned.random_uniform(size=(2, 3)).shape) == (2, 3)
+
+
+def test_dispatch_tracing():
+    for lib in _eager_libs():
+        x = ivy.array([1., 2., 3.], f=lib)
+        ivy.verbosity.set_level(1)
+        try:
+            ivy.verbosity.events.clear()
+            ivy.reduce_sum(x)
+            ivy.reduce_sum(x, f=lib)
+            with lib.use:
+                ivy.reduce_sum(x)
+            assert [(event.fn_name, event.framework, event.source) for event in ivy.verbosity.events] == \
+                [('reduce_sum', lib, 'inferred'), ('reduce_sum', lib, 'explicit'), ('set_framework', lib, 'push'),
+                 ('reduce_sum', lib, 'stack'), ('unset_framework', lib, 'pop')]
+        finally:
+            ivy.verbosity.set_level(0)
+        ivy.verbosity.events.clear()
+        ivy.reduce_sum(x)
+        assert len(ivy.verbosity.events) == 0
+
+
+def test_dispatch_tracing_from_level_assignment():
+    for lib in _eager_libs():
+        x = ivy.array([1., 2., 3.], f=lib)
+        ivy.verbosity.level = 1
+        try:
+            assert ivy.verbosity.level == 1
+            ivy.verbosity.events.clear()
+            ivy.reduce_sum(x, f=lib)
+            assert [(event.fn_name, event.source) for event in ivy.verbosity.events] == [('reduce_sum', 'explicit')]
+        finally:
+            ivy.verbosity.level = 0
+        assert ivy.verbosity.level == 0
+        ivy.verbosity.events.clear()
+        ivy.reduce_sum(x, f=lib)
+        assert len(ivy.verbosity.events) == 0
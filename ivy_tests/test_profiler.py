@@ -0,0 +1,45 @@
+"""
+Collection of tests for the ivy profiler
+"""
+
+# global
+import os
+import csv
+import tempfile
+
+# local
+import ivy
+import ivy.profiler
+import ivy_tests.helpers as helpers
+
+
+def test_profiler():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            continue
+        x = ivy.array([1., 2., 3.], f=lib)
+        original_reduce_sum = ivy.reduce_sum
+        ivy.profiler.reset()
+        with ivy.profiler.Profile():
+            assert ivy.reduce_sum is not original_reduce_sum
+            for _ in range(3):
+                ivy.reduce_sum(x)
+            ivy.core.general.expand_dims(x, 0)
+        assert ivy.reduce_sum is original_reduce_sum
+        ivy.reduce_sum(x)
+
+        framework_name = lib.__name__.split('.')[-1]
+        results = ivy.profiler.results()
+        assert results['reduce_sum'][framework_name]['calls'] == 3
+        assert results['expand_dims'][framework_name]['calls'] == 1
+        times = results['reduce_sum'][framework_name]
+        assert 0 < times['backend_time'] <= times['total_time']
+        assert abs(times['total_time'] - times['backend_time'] - times['overhead_time']) < 1e-9
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            ivy.profiler.write_csvs(dirpath)
+            with open(os.path.join(dirpath, 'mean_runtime_analysis.csv')) as file:
+                rows = list(csv.reader(file))
+        assert sorted([row[0] for row in rows]) == ['expand_dims', 'reduce_sum']
+        assert all([len(row) == 8 for row in rows])
+        ivy.profiler.reset()
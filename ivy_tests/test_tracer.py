@@ -0,0 +1,84 @@
+"""
+Collection of tests for the ivy tracer
+"""
+
+# global
+import os
+import json
+import tempfile
+import threading
+
+# local
+import ivy
+import ivy.tracer
+import ivy_tests.helpers as helpers
+
+
+def test_tracer():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            continue
+        x = ivy.array([1., 2., 3.], f=lib)
+        original_reduce_sum = ivy.reduce_sum
+        ivy.tracer.reset()
+        with tempfile.TemporaryDirectory() as dirpath:
+            filepath = os.path.join(dirpath, 'trace.json')
+            with ivy.tracer.Trace(filepath):
+                assert ivy.reduce_sum is not original_reduce_sum
+                ivy.reduce_sum(x)
+                thread = threading.Thread(target=lambda: ivy.core.general.expand_dims(x, 0))
+                thread.start()
+                thread.join()
+                container = ivy.Container({'a': x})
+                container_filepath = os.path.join(dirpath, 'container.hdf5')
+                container.to_disk(container_filepath)
+                ivy.Container.from_disk(container_filepath, f=lib)
+            assert ivy.reduce_sum is original_reduce_sum
+            with open(filepath) as file:
+                trace_events = json.load(file)['traceEvents']
+
+        complete_events = [event for event in trace_events if event['ph'] == 'X']
+        names = [event['name'] for event in complete_events]
+        for name in ['reduce_sum', 'expand_dims', 'Container.to_disk', 'Container.from_disk', 'write_h5_dataset',
+                     'read_h5_dataset']:
+            assert name in names
+
+        # backend call is nested inside the templated call
+        outer = [event for event in complete_events if event['name'] == 'reduce_sum' and
+                 event['cat'] == 'ivy.core.reductions'][0]
+        inner = [event for event in complete_events if event['name'] == 'reduce_sum' and
+                 event['cat'].startswith('ivy.') and event['cat'] != 'ivy.core.reductions'][0]
+        assert outer['ts'] <= inner['ts'] and inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+
+        # calls from the worker thread have their own thread id
+        tids = {event['name']: event['tid'] for event in complete_events}
+        assert tids['expand_dims'] != tids['reduce_sum']
+        assert len([event for event in trace_events if event['ph'] == 'M']) == 2
+        ivy.tracer.reset()
+
+
+def test_tracer_buffer_size():
+    for lib, call in helpers.calls:
+        if call in [helpers.tf_graph_call, helpers.mx_graph_call]:
+            continue
+        x = ivy.array([1., 2., 3.], f=lib)
+        original_buffer_size = ivy.tracer._events.maxlen
+        ivy.tracer.reset()
+        with tempfile.TemporaryDirectory() as dirpath:
+            filepath = os.path.join(dirpath, 'trace.json')
+            with ivy.tracer.Trace(filepath, buffer_size=4):
+                for _ in range(5):
+                    ivy.core.reductions.reduce_sum(x)
+            with open(filepath) as file:
+                trace = json.load(file)
+
+        # only the most recent events are retained, with the older events counted as dropped
+        complete_events = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+        assert len(complete_events) == 4
+        assert ivy.tracer.num_dropped() == 6
+        assert trace['otherData'] == {'dropped_events': 6, 'buffer_size': 4}
+
+        ivy.tracer.reset()
+        assert ivy.tracer.num_dropped() == 0
+        ivy.tracer.start(original_buffer_size)
+        ivy.tracer.stop()
@@ -0,0 +1,162 @@
+"""
+Regression-tracking benchmark suite for every templated ivy function, across input sizes and frameworks.
+
+Results are stored as json baselines, and a new run is compared against a baseline, exiting with a non-zero status if
+any function has regressed. A function regresses if its new median exceeds the baseline median by more than both the
+relative threshold, and the given number of interquartile ranges of the two runs. A function also regresses if it
+fails to build or run, or is missing from the new run, while it has a baseline timing.
+
+save a baseline:    python -m test_runtime.benchmark -o baseline.json
+compare a new run:  python -m test_runtime.benchmark -o new.json -b baseline.json
+"""
+
+# global
+import sys
+import json
+import time
+import argparse
+import platform
+import importlib
+import logging
+import numpy as np
+
+# local
+import ivy.profiler
+from test_runtime import op_specs
+
+SIZES = [int(10 ** exponent) for exponent in range(1, 8)]
+
+# specs whose inputs or outputs grow faster than the dim, or which go through python lists, are capped in size
+_MAX_DIMS = {'array': int(1e5), 'to_list': int(1e5), 'one_hot': int(1e5), 'identity': int(1e6),
+             'stack_images': int(1e4), 'compile_fn': int(1e5), 'svd': int(1e5), 'pinv': int(1e5)}
+
+
+def _block(result):
+    # wait for asynchronously dispatched backends, such as jax, to finish computing the result
+    if isinstance(result, (list, tuple)):
+        for item in result:
+            _block(item)
+    elif hasattr(result, 'block_until_ready'):
+        result.block_until_ready()
+
+
+def _time_fn(fn, args, kwargs, num_runs, max_time):
+    _block(fn(*args, **kwargs))
+    times = list()
+    total_start = time.perf_counter()
+    for _ in range(num_runs):
+        start = time.perf_counter()
+        _block(fn(*args, **kwargs))
+        times.append(time.perf_counter() - start)
+        if time.perf_counter() - total_start > max_time and len(times) >= 5:
+            break
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return {'median': float(median), 'iqr': float(q3 - q1), 'runs': len(times)}
+
+
+def run(framework_names, sizes, num_runs, max_time, names=None):
+    """
+    Benchmark every op specification for each framework and size.
+
+    :return: Dict of framework name to function name to str(size) to dict of median, iqr and number of runs, or to
+             dict of the error message if the function failed to build or run.
+    """
+    logging.disable(logging.WARNING)
+    results = dict()
+    for framework_name in framework_names:
+        try:
+            lib = importlib.import_module('ivy.' + framework_name)
+        except ImportError:
+            print('skipping {}, as it is not installed'.format(framework_name))
+            continue
+        results[framework_name] = dict()
+        for name in op_specs.SPECS:
+            if names and name not in names:
+                continue
+            for size in sizes:
+                if size > _MAX_DIMS.get(name, sizes[-1]):
+                    continue
+                # noinspection PyBroadException
+                try:
+                    fn, args, kwargs = op_specs.build(name, size, lib)
+                    timing = _time_fn(fn, args, kwargs, num_runs, max_time)
+                except Exception as e:
+                    timing = {'error': '{}: {}'.format(type(e).__name__, e)}
+                results[framework_name].setdefault(name, dict())[str(size)] = timing
+    return results
+
+
+def compare(baseline, results, threshold, num_iqrs):
+    """
+    Compare results against a baseline. Baseline timings which are missing from the results, or whose function
+    failed in the results, are regressions with a new median of None.
+
+    :return: List of (framework name, function name, size, baseline median, new median) for each regression.
+    """
+    regressions = list()
+    for framework_name, fn_dict in baseline.items():
+        for name, size_dict in fn_dict.items():
+            for size, base in size_dict.items():
+                if 'median' not in base:
+                    continue
+                timing = results.get(framework_name, dict()).get(name, dict()).get(size, dict())
+                if 'median' not in timing:
+                    regressions.append((framework_name, name, int(size), base['median'], None))
+                    continue
+                allowed = max(base['median'] * threshold, num_iqrs * max(base['iqr'], timing['iqr']))
+                if timing['median'] > base['median'] + allowed:
+                    regressions.append((framework_name, name, int(size), base['median'], timing['median']))
+    return regressions
+
+
+def _select(results, framework_names, sizes, names=None):
+    # restrict results to the frameworks, sizes and functions of a run
+    return {framework_name: {name: {size: timing for size, timing in size_dict.items() if int(size) in sizes}
+                             for name, size_dict in fn_dict.items() if not names or name in names}
+            for framework_name, fn_dict in results.items() if framework_name in framework_names}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-f', '--frameworks', nargs='+', default=ivy.profiler.FWS)
+    parser.add_argument('-s', '--sizes', nargs='+', type=float, default=SIZES)
+    parser.add_argument('-n', '--num_runs', type=int, default=50)
+    parser.add_argument('-t', '--max_time', type=float, default=1.,
+                        help='maximum seconds spent timing each function at each size')
+    parser.add_argument('--fns', nargs='+', default=None, help='names of the functions to benchmark, default all')
+    parser.add_argument('-o', '--output', type=str, default='benchmark.json')
+    parser.add_argument('-b', '--baseline', type=str, default=None)
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='minimum relative increase of the median to count as a regression')
+    parser.add_argument('--num_iqrs', type=float, default=1.5,
+                        help='minimum increase of the median, in interquartile ranges, to count as a regression')
+    parsed_args = parser.parse_args()
+
+    sizes = [int(size) for size in parsed_args.sizes]
+    results = run(parsed_args.frameworks, sizes, parsed_args.num_runs, parsed_args.max_time, parsed_args.fns)
+    with open(parsed_args.output, 'w') as file:
+        json.dump({'machine': platform.platform(), 'python': platform.python_version(), 'results': results}, file,
+                  indent=1, sort_keys=True)
+    print('wrote {}'.format(parsed_args.output))
+    if parsed_args.baseline is None:
+        return 0
+
+    with open(parsed_args.baseline) as file:
+        baseline = json.load(file)['results']
+    baseline = _select(baseline, parsed_args.frameworks, sizes, parsed_args.fns)
+    regressions = compare(baseline, results, parsed_args.threshold, parsed_args.num_iqrs)
+    for framework_name, name, size, base_median, new_median in sorted(regressions, key=lambda item: item[:3]):
+        if new_median is None:
+            error = results.get(framework_name, dict()).get(name, dict()).get(str(size), dict()).get('error', 'missing')
+            print('REGRESSION {} {} size {}: {:.2f}us -> {}'.format(framework_name, name, size, base_median * 1e6,
+                                                                    error))
+            continue
+        print('REGRESSION {} {} size {}: {:.2f}us -> {:.2f}us ({:+.1f}%)'.format(
+            framework_name, name, size, base_median * 1e6, new_median * 1e6,
+            (new_median / base_median - 1) * 100))
+    print('{} regressions'.format(len(regressions)))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
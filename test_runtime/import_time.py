@@ -0,0 +1,43 @@
+"""
+Measures the wall time and number of imported modules for a fresh `import ivy`
+"""
+
+# global
+import sys
+import json
+import argparse
+import subprocess
+import numpy as np
+
+_HEAVY_MODULES = ['h5py', 'jax', 'tensorflow', 'torch', 'mxnet', 'ivy.numpy', 'ivy.jax', 'ivy.tensorflow', 'ivy.torch',
+                  'ivy.mxnd', 'ivy.mxsym']
+
+_MEASURE_SRC = '''
+import sys, time, json
+before = set(sys.modules)
+start = time.perf_counter()
+import ivy
+duration = time.perf_counter() - start
+loaded = [name for name in set(sys.modules) - before
+          if not type(sys.modules[name]).__name__ == '_LazyModule']
+print(json.dumps({{'time': duration, 'num_imports': len(loaded),
+                  'heavy': [name for name in {} if name in loaded]}}))
+'''
+
+
+def main(num_runs):
+    results = list()
+    for _ in range(num_runs):
+        output = subprocess.check_output([sys.executable, '-c', _MEASURE_SRC.format(_HEAVY_MODULES)])
+        results.append(json.loads(output.decode().strip().split('\n')[-1]))
+    times = np.asarray([result['time'] for result in results])
+    print('import ivy: median {:.2f}ms, min {:.2f}ms, max {:.2f}ms over {} runs'.format(
+        np.median(times) * 1000, np.min(times) * 1000, np.max(times) * 1000, num_runs))
+    print('modules imported: {}'.format(results[-1]['num_imports']))
+    print('heavy modules imported: {}'.format(results[-1]['heavy']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', '--num_runs', type=int, default=10)
+    main(parser.parse_args().num_runs)
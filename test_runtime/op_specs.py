@@ -0,0 +1,226 @@
+"""
+Input specifications for calling every templated ivy function at a given input dimension
+"""
+
+# global
+import numpy as np
+import collections
+
+# local
+import ivy.core.general as ivy_gen
+import ivy.core.gradients as ivy_grad
+import ivy.core.image as ivy_image
+import ivy.core.linalg as ivy_linalg
+import ivy.core.logic as ivy_logic
+import ivy.core.math as ivy_math
+import ivy.core.random as ivy_rand
+import ivy.core.reductions as ivy_red
+import ivy.neural_net.activations as ivy_act
+import ivy.neural_net.layers as ivy_layers
+
+
+def _uniform(lib, shape, low=0., high=1.):
+    return ivy_gen.array(np.random.uniform(low, high, shape).astype(np.float32), f=lib)
+
+
+def _randint(lib, shape, high):
+    return ivy_gen.array(np.random.randint(0, high, shape), f=lib)
+
+
+def _channels_last(lib):
+    return lib.__name__ == 'ivy.tensorflow'
+
+
+def _conv_input(lib, dim, spatial_dims):
+    x = _uniform(lib, [dim] + [2] * spatial_dims + [1])
+    if _channels_last(lib):
+        return x, 'N' + 'DHW'[3 - spatial_dims:] + 'C'
+    return ivy_gen.reshape(x, [dim, 1] + [2] * spatial_dims, f=lib), 'NC' + 'DHW'[3 - spatial_dims:]
+
+
+def _conv_filters(lib, spatial_dims):
+    return _uniform(lib, [2] * spatial_dims + [1, 1])
+
+
+def _conv(fn, spatial_dims, transpose=False, **kwargs):
+    def spec(dim, lib):
+        x, data_format = _conv_input(lib, dim, spatial_dims)
+        filters = _conv_filters(lib, spatial_dims)
+        filter_shape = [2] * spatial_dims
+        if transpose:
+            output_shape = [dim] + filter_shape + [1] if _channels_last(lib) else [dim, 1] + filter_shape
+            return fn, (x, filters, 1, 'SAME', output_shape, data_format), dict(filter_shape=filter_shape,
+                                                                                num_filters=1, **kwargs)
+        return fn, (x, filters, 1, 'SAME', data_format), dict(filter_shape=filter_shape, num_filters=1, **kwargs)
+    return spec
+
+
+def _unary(fn, low=0., high=1.):
+    return lambda dim, lib: (fn, (_uniform(lib, [dim], low, high),), {})
+
+
+def _binary(fn):
+    return lambda dim, lib: (fn, (_uniform(lib, [dim]), _uniform(lib, [dim])), {})
+
+
+def _bool_binary(fn):
+    return lambda dim, lib: (fn, (_uniform(lib, [dim]) > 0.5, _uniform(lib, [dim]) > 0.5), {})
+
+
+def _execute_with_gradients(dim, lib):
+    xs = [ivy_grad.variable(_uniform(lib, [dim]), f=lib)]
+    return ivy_grad.execute_with_gradients, (lambda xs_in: ivy_red.reduce_sum(xs_in[0] * xs_in[0]), xs), dict(f=lib)
+
+
+def _gradient_descent_update(dim, lib):
+    ws = [ivy_grad.variable(_uniform(lib, [dim]), f=lib)]
+    return ivy_grad.gradient_descent_update, (ws, [_uniform(lib, [dim])], 0.1), dict(f=lib)
+
+
+# function name -> callable of (dim, lib) returning (function, args, kwargs)
+SPECS = collections.OrderedDict()
+
+# general
+SPECS['array'] = lambda dim, lib: (ivy_gen.array, (list(np.random.uniform(size=dim)),), dict(f=lib))
+SPECS['to_numpy'] = _unary(ivy_gen.to_numpy)
+SPECS['to_list'] = _unary(ivy_gen.to_list)
+SPECS['shape'] = _unary(ivy_gen.shape)
+SPECS['get_num_dims'] = _unary(ivy_gen.get_num_dims)
+SPECS['minimum'] = _binary(ivy_gen.minimum)
+SPECS['maximum'] = _binary(ivy_gen.maximum)
+SPECS['clip'] = lambda dim, lib: (ivy_gen.clip, (_uniform(lib, [dim], -1., 2.), 0., 1.), {})
+SPECS['round'] = _unary(ivy_gen.round)
+SPECS['floormod'] = _binary(ivy_gen.floormod)
+SPECS['floor'] = _unary(ivy_gen.floor)
+SPECS['ceil'] = _unary(ivy_gen.ceil)
+SPECS['abs'] = _unary(ivy_gen.abs, -1.)
+SPECS['argmax'] = _unary(ivy_gen.argmax)
+SPECS['argmin'] = _unary(ivy_gen.argmin)
+SPECS['cast'] = lambda dim, lib: (ivy_gen.cast, (_uniform(lib, [dim]), 'float64'), {})
+SPECS['arange'] = lambda dim, lib: (ivy_gen.arange, (dim,), dict(f=lib))
+SPECS['linspace'] = lambda dim, lib: (ivy_gen.linspace, (0., 1., dim), dict(f=lib))
+SPECS['concatenate'] = lambda dim, lib: (ivy_gen.concatenate, ([_uniform(lib, [dim]), _uniform(lib, [dim])], 0), {})
+SPECS['flip'] = lambda dim, lib: (ivy_gen.flip, (_uniform(lib, [dim]), 0), {})
+SPECS['stack'] = lambda dim, lib: (ivy_gen.stack, ([_uniform(lib, [dim]), _uniform(lib, [dim])], 0), {})
+SPECS['unstack'] = lambda dim, lib: (ivy_gen.unstack, (_uniform(lib, [1, dim]), 0), dict(num_outputs=1))
+SPECS['split'] = lambda dim, lib: (ivy_gen.split, (_uniform(lib, [1, dim]), 1, 0), {})
+SPECS['tile'] = lambda dim, lib: (ivy_gen.tile, (_uniform(lib, [1]), [dim]), {})
+SPECS['zero_pad'] = lambda dim, lib: (ivy_gen.zero_pad, (_uniform(lib, [dim]), [(dim, dim)]), dict(x_shape=[dim]))
+SPECS['swapaxes'] = lambda dim, lib: (ivy_gen.swapaxes, (_uniform(lib, [2, dim]), 1, 0), {})
+SPECS['transpose'] = lambda dim, lib: (ivy_gen.transpose, (_uniform(lib, [2, dim]), (1, 0)), {})
+SPECS['expand_dims'] = lambda dim, lib: (ivy_gen.expand_dims, (_uniform(lib, [dim]), 0), {})
+SPECS['where'] = lambda dim, lib: (ivy_gen.where, (_uniform(lib, [dim]) > 0.5, _uniform(lib, [dim]),
+                                                   _uniform(lib, [dim])), dict(condition_shape=[dim], x_shape=[dim]))
+SPECS['indices_where'] = lambda dim, lib: (ivy_gen.indices_where, (_uniform(lib, [dim]) > 0.5,), {})
+SPECS['reshape'] = lambda dim, lib: (ivy_gen.reshape, (_uniform(lib, [dim]), [1, dim]), {})
+SPECS['squeeze'] = lambda dim, lib: (ivy_gen.squeeze, (_uniform(lib, [1, dim]),), {})
+SPECS['zeros'] = lambda dim, lib: (ivy_gen.zeros, ([dim],), dict(f=lib))
+SPECS['zeros_like'] = _unary(ivy_gen.zeros_like)
+SPECS['ones'] = lambda dim, lib: (ivy_gen.ones, ([dim],), dict(f=lib))
+SPECS['ones_like'] = _unary(ivy_gen.ones_like)
+SPECS['one_hot'] = lambda dim, lib: (ivy_gen.one_hot, (_randint(lib, [dim], int(dim ** 0.5)), int(dim ** 0.5)), {})
+SPECS['cross'] = lambda dim, lib: (ivy_gen.cross, (_uniform(lib, [dim, 3]), _uniform(lib, [dim, 3])), {})
+SPECS['matmul'] = lambda dim, lib: (ivy_gen.matmul, (_uniform(lib, [1, 1, dim]), _uniform(lib, [1, dim, 1])),
+                                    dict(batch_shape=[1]))
+SPECS['cumsum'] = lambda dim, lib: (ivy_gen.cumsum, (_uniform(lib, [dim]), 0), {})
+SPECS['identity'] = lambda dim, lib: (ivy_gen.identity, (int(dim ** 0.5),), dict(f=lib))
+SPECS['scatter_flat'] = lambda dim, lib: (ivy_gen.scatter_flat, (_randint(lib, [dim], dim), _uniform(lib, [dim]),
+                                                                 dim), {})
+SPECS['scatter_nd'] = lambda dim, lib: (ivy_gen.scatter_nd, (_randint(lib, [dim, 1], dim), _uniform(lib, [dim]),
+                                                             [dim]), {})
+SPECS['gather_flat'] = lambda dim, lib: (ivy_gen.gather_flat, (_uniform(lib, [dim]), _randint(lib, [dim], dim)), {})
+SPECS['gather_nd'] = lambda dim, lib: (ivy_gen.gather_nd, (_uniform(lib, [dim]), _randint(lib, [dim, 1], dim)),
+                                       dict(indices_shape=[dim, 1]))
+SPECS['get_device'] = _unary(ivy_gen.get_device)
+SPECS['dtype'] = _unary(ivy_gen.dtype)
+SPECS['compile_fn'] = lambda dim, lib: (ivy_gen.compile_fn, (lambda x: x ** 2, _uniform(lib, [dim])), {})
+
+# gradients
+SPECS['variable'] = _unary(ivy_grad.variable)
+SPECS['execute_with_gradients'] = _execute_with_gradients
+SPECS['gradient_descent_update'] = _gradient_descent_update
+SPECS['stop_gradient'] = _unary(ivy_grad.stop_gradient)
+
+# image
+SPECS['stack_images'] = lambda dim, lib: (ivy_image.stack_images, ([_uniform(lib, [2, 2, 1])
+                                                                    for _ in range(min(dim, int(1e4)))],), {})
+SPECS['bilinear_resample'] = lambda dim, lib: (ivy_image.bilinear_resample, (_uniform(lib, [dim, 2, 2, 1]),
+                                                                             _uniform(lib, [dim, 2, 2, 2])), {})
+SPECS['gradient_image'] = lambda dim, lib: (ivy_image.gradient_image, (_uniform(lib, [dim, 2, 2, 1]),), {})
+
+# linalg
+SPECS['svd'] = lambda dim, lib: (ivy_linalg.svd, (_uniform(lib, [dim, 2, 2]),), {})
+SPECS['norm'] = lambda dim, lib: (ivy_linalg.norm, (_uniform(lib, [dim, 2, 2]),), {})
+SPECS['inv'] = lambda dim, lib: (ivy_linalg.inv, (_uniform(lib, [dim, 2, 2]),), {})
+SPECS['pinv'] = lambda dim, lib: (ivy_linalg.pinv, (_uniform(lib, [dim, 2, 2]),), {})
+SPECS['vector_to_skew_symmetric_matrix'] = lambda dim, lib: (ivy_linalg.vector_to_skew_symmetric_matrix,
+                                                             (_uniform(lib, [dim, 3]),), {})
+
+# logic
+SPECS['logical_and'] = _bool_binary(ivy_logic.logical_and)
+SPECS['logical_or'] = _bool_binary(ivy_logic.logical_or)
+SPECS['logical_not'] = lambda dim, lib: (ivy_logic.logical_not, (_uniform(lib, [dim]) > 0.5,), {})
+
+# math
+SPECS['sin'] = _unary(ivy_math.sin)
+SPECS['cos'] = _unary(ivy_math.cos)
+SPECS['tan'] = _unary(ivy_math.tan)
+SPECS['asin'] = _unary(ivy_math.asin)
+SPECS['acos'] = _unary(ivy_math.acos)
+SPECS['atan'] = _unary(ivy_math.atan)
+SPECS['atan2'] = _binary(ivy_math.atan2)
+SPECS['sinh'] = _unary(ivy_math.sinh)
+SPECS['cosh'] = _unary(ivy_math.cosh)
+SPECS['tanh'] = _unary(ivy_math.tanh)
+SPECS['asinh'] = _unary(ivy_math.asinh)
+SPECS['acosh'] = _unary(ivy_math.acosh, 1., 2.)
+SPECS['atanh'] = _unary(ivy_math.atanh)
+SPECS['log'] = _unary(ivy_math.log, 0.1, 1.)
+SPECS['exp'] = _unary(ivy_math.exp)
+
+# random
+SPECS['random_uniform'] = lambda dim, lib: (ivy_rand.random_uniform, (0., 1., (dim,)), dict(f=lib))
+SPECS['randint'] = lambda dim, lib: (ivy_rand.randint, (0, 10, (dim,)), dict(f=lib))
+SPECS['seed'] = lambda dim, lib: (ivy_rand.seed, (0,), dict(f=lib))
+SPECS['shuffle'] = _unary(ivy_rand.shuffle)
+
+# reductions
+SPECS['reduce_sum'] = lambda dim, lib: (ivy_red.reduce_sum, (_uniform(lib, [dim]), -1), {})
+SPECS['reduce_prod'] = lambda dim, lib: (ivy_red.reduce_prod, (_uniform(lib, [dim]), -1), {})
+SPECS['reduce_mean'] = lambda dim, lib: (ivy_red.reduce_mean, (_uniform(lib, [dim]), -1), {})
+SPECS['reduce_min'] = lambda dim, lib: (ivy_red.reduce_min, (_uniform(lib, [dim]), -1), {})
+SPECS['reduce_max'] = lambda dim, lib: (ivy_red.reduce_max, (_uniform(lib, [dim]), -1), {})
+
+# activations
+SPECS['relu'] = _unary(ivy_act.relu, -1.)
+SPECS['leaky_relu'] = _unary(ivy_act.leaky_relu, -1.)
+SPECS['nn_tanh'] = _unary(ivy_act.tanh, -1.)
+SPECS['sigmoid'] = _unary(ivy_act.sigmoid, -1.)
+SPECS['softmax'] = lambda dim, lib: (ivy_act.softmax, (_uniform(lib, [1, dim]),), {})
+SPECS['softplus'] = _unary(ivy_act.softplus, -1.)
+
+# layers
+SPECS['conv1d'] = _conv(ivy_layers.conv1d, 1)
+SPECS['conv1d_transpose'] = _conv(ivy_layers.conv1d_transpose, 1, transpose=True)
+SPECS['conv2d'] = _conv(ivy_layers.conv2d, 2)
+SPECS['conv2d_transpose'] = _conv(ivy_layers.conv2d_transpose, 2, transpose=True)
+SPECS['depthwise_conv2d'] = lambda dim, lib: (ivy_layers.depthwise_conv2d,
+                                              (_conv_input(lib, dim, 2)[0], _uniform(lib, [2, 2, 1]), 1, 'SAME',
+                                               _conv_input(lib, 1, 2)[1]),
+                                              dict(filter_shape=[2, 2], num_filters=1, num_channels=1))
+SPECS['conv3d'] = _conv(ivy_layers.conv3d, 3)
+SPECS['conv3d_transpose'] = _conv(ivy_layers.conv3d_transpose, 3, transpose=True)
+SPECS['linear'] = lambda dim, lib: (ivy_layers.linear, (_uniform(lib, [1, dim]), _uniform(lib, [2, dim]),
+                                                        _uniform(lib, [2])), dict(num_hidden=2))
+
+
+def build(name, dim, lib):
+    """
+    Build the function and inputs for the named specification.
+
+    :return: Tuple of function, args and kwargs, with the framework set explicitly in kwargs.
+    """
+    fn, args, kwargs = SPECS[name](dim, lib)
+    kwargs = dict(kwargs)
+    kwargs['f'] = lib
+    return fn, args, kwargs
@@ -0,0 +1,54 @@
+"""
+Profiles every templated ivy function with the built-in ivy profiler, and writes the same csvs as analyse_runtimes.py,
+without requiring the source-rewritten with_time_logs copy of ivy.
+"""
+
+# global
+import os
+import argparse
+import importlib
+import logging
+
+# local
+import ivy.profiler
+from test_runtime import op_specs
+
+
+def _available_frameworks(framework_names):
+    frameworks = list()
+    for framework_name in framework_names:
+        try:
+            frameworks.append(importlib.import_module('ivy.' + framework_name))
+        except ImportError:
+            print('skipping {}, as it is not installed'.format(framework_name))
+    return frameworks
+
+
+def main(dim, num_runs, framework_names, csv_dir):
+    logging.disable(logging.WARNING)
+    frameworks = _available_frameworks(framework_names)
+    ivy.profiler.reset()
+    for lib in frameworks:
+        for name in op_specs.SPECS:
+            # noinspection PyBroadException
+            try:
+                fn, args, kwargs = op_specs.build(name, dim, lib)
+                fn(*args, **kwargs)
+            except Exception:
+                continue
+            with ivy.profiler.Profile():
+                # look the function up again, to call the installed profiling wrapper
+                fn = getattr(importlib.import_module(fn.__module__), fn.__name__)
+                for _ in range(num_runs):
+                    fn(*args, **kwargs)
+    ivy.profiler.write_csvs(os.path.join(csv_dir, str(dim)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-d', '--dim', type=int, default=int(1e4))
+    parser.add_argument('-n', '--num_runs', type=int, default=100)
+    parser.add_argument('-f', '--frameworks', nargs='+', default=ivy.profiler.FWS)
+    parser.add_argument('-c', '--csv_dir', type=str, default='csvs')
+    parsed_args = parser.parse_args()
+    main(parsed_args.dim, parsed_args.num_runs, parsed_args.frameworks, parsed_args.csv_dir)
@@ -0,0 +1,41 @@
+"""
+Collection of tests for the regression comparison of the benchmark suite
+"""
+
+# local
+from test_runtime import benchmark
+
+
+def _timing(median, iqr=0.):
+    return {'median': median, 'iqr': iqr, 'runs': 10}
+
+
+def test_compare():
+    baseline = {'numpy': {'add': {'10': _timing(1.), '100': _timing(1., 0.5)},
+                          'sub': {'10': _timing(1.)},
+                          'mul': {'10': _timing(1.)},
+                          'div': {'10': {'error': 'ValueError: '}}}}
+    results = {'numpy': {'add': {'10': _timing(1.05), '100': _timing(1.5, 0.1)},
+                         'sub': {'10': {'error': 'TypeError: unsupported'}},
+                         'div': {'10': _timing(100.)}}}
+
+    # within the relative threshold, within 1.5 interquartile ranges, failing, and missing
+    regressions = benchmark.compare(baseline, results, 0.1, 1.5)
+    assert sorted(regressions, key=lambda item: item[:3]) == [('numpy', 'mul', 10, 1., None),
+                                                               ('numpy', 'sub', 10, 1., None)]
+
+    # exceeding both the relative threshold and the interquartile ranges
+    regressions = benchmark.compare(baseline, results, 0.01, 0.5)
+    assert sorted(regressions, key=lambda item: item[:3]) == [('numpy', 'add', 10, 1., 1.05),
+                                                               ('numpy', 'add', 100, 1., 1.5),
+                                                               ('numpy', 'mul', 10, 1., None),
+                                                               ('numpy', 'sub', 10, 1., None)]
+
+    # new functions and frameworks without baseline timings are not regressions
+    assert benchmark.compare({}, results, 0.1, 1.5) == []
+
+
+def test_select():
+    results = {'numpy': {'add': {'10': _timing(1.), '100': _timing(1.)}, 'sub': {'10': _timing(1.)}},
+               'torch': {'add': {'10': _timing(1.)}}}
+    assert benchmark._select(results, ['numpy'], [10], ['add']) == {'numpy': {'add': {'10': _timing(1.)}}}
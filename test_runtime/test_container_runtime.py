@@ -0,0 +1,568 @@
+"""
+Collection of runtime tests for container disk loading
+"""
+
+DIM = int(1e5)
+
+
+# global
+import os
+import time
+import random
+import tempfile
+import numpy as np
+
+# local
+import ivy.core.general as ivy_gen
+import ivy.core.random as ivy_rand
+from ivy.core.container import Container
+import ivy.core.container_io as ivy_cont_io
+this_file_dir = os.path.dirname(os.path.realpath(__file__))
+
+# local
+import ivy_tests.helpers as helpers
+from test_runtime.utils import append_to_file
+
+
+def _from_disk_via_lists(filepath, f):
+    # the previous loading path, which round-trips each dataset through a python list
+    h5_obj = ivy_cont_io._h5py.File(filepath, 'r')
+    try:
+        return Container({key: ivy_gen.array(list(value[:]), f=f) for key, value in h5_obj.items()})
+    finally:
+        h5_obj.close()
+
+
+def _time_calls(fn, num_calls=10):
+    times = list()
+    for _ in range(num_calls):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return np.median(np.asarray(times))
+
+
+def test_from_disk():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/from_disk.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    for lib, call in [(l, c) for l, c in helpers.calls if c not in [helpers.tf_graph_call, helpers.mx_graph_call]]:
+
+        append_to_file(fname, '{}'.format(lib))
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            filepath = os.path.join(dirpath, 'container.hdf5')
+            container = Container({'a': np.random.uniform(size=(DIM, 8)).astype(np.float32),
+                                   'b': np.random.uniform(size=(DIM,)).astype(np.float32)})
+            container.to_disk(filepath, max_batch_size=DIM)
+            out = Container({'a': np.empty((DIM, 8), np.float32), 'b': np.empty((DIM,), np.float32)})
+
+            list_time = _time_calls(lambda: _from_disk_via_lists(filepath, lib))
+            direct_time = _time_calls(lambda: Container.from_disk(filepath, lib))
+            read_direct_time = _time_calls(lambda: Container.from_disk(filepath, lib, out=out))
+
+        append_to_file(fname, 'via lists: {}'.format(list_time))
+        append_to_file(fname, 'direct: {}'.format(direct_time))
+        append_to_file(fname, 'read_direct: {}'.format(read_direct_time))
+        assert direct_time < list_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def _shuffle_h5_file_elementwise(filepath, seed_value=0):
+    # the previous shuffling path, which swaps dataset rows one at a time through h5py indexing
+    h5_obj = ivy_cont_io._h5py.File(filepath, 'a')
+    try:
+        for key, value in sorted(h5_obj.items()):
+            random.seed(seed_value)
+            random.shuffle(value)
+    finally:
+        h5_obj.close()
+
+
+def test_shuffle_h5_file():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/shuffle_h5_file.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    num_rows = int(DIM / 10)
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        filepath = os.path.join(dirpath, 'container.hdf5')
+        container = Container({'a': np.random.uniform(size=(num_rows, 8)).astype(np.float32),
+                               'b': np.random.uniform(size=(num_rows,)).astype(np.float32)})
+
+        container.to_disk(filepath, max_batch_size=num_rows)
+        start = time.perf_counter()
+        _shuffle_h5_file_elementwise(filepath)
+        elementwise_rows_per_second = 2 * num_rows / (time.perf_counter() - start)
+
+        container.to_disk(filepath, max_batch_size=num_rows)
+        in_memory_rows_per_second = Container.shuffle_h5_file(filepath)
+
+        container.to_disk(filepath, max_batch_size=num_rows)
+        out_of_core_rows_per_second = Container.shuffle_h5_file(filepath, memory_budget=num_rows * 4)
+
+    append_to_file(fname, 'elementwise rows/s: {}'.format(elementwise_rows_per_second))
+    append_to_file(fname, 'in memory rows/s: {}'.format(in_memory_rows_per_second))
+    append_to_file(fname, 'out-of-core rows/s: {}'.format(out_of_core_rows_per_second))
+    assert out_of_core_rows_per_second > elementwise_rows_per_second
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_batches_from_disk():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/batches_from_disk.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    batch_size = int(DIM / 10)
+    compute_time = 0.01
+    for lib, call in [(l, c) for l, c in helpers.calls if c not in [helpers.tf_graph_call, helpers.mx_graph_call]]:
+
+        append_to_file(fname, '{}'.format(lib))
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            filepath = os.path.join(dirpath, 'container.hdf5')
+            Container({'a': np.random.uniform(size=(DIM, 8)).astype(np.float32),
+                       'b': np.random.uniform(size=(DIM,)).astype(np.float32)}).to_disk(filepath)
+
+            # one from_disk call per step, which reopens the file and blocks on the read
+            start = time.perf_counter()
+            for batch_start in range(0, DIM, batch_size):
+                Container.from_disk(filepath, lib, slice(batch_start, batch_start + batch_size))
+                time.sleep(compute_time)
+            from_disk_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in Container.batches_from_disk(filepath, lib, batch_size):
+                time.sleep(compute_time)
+            prefetch_time = time.perf_counter() - start
+
+        append_to_file(fname, 'from_disk per step: {}'.format(from_disk_time))
+        append_to_file(fname, 'prefetching iterator: {}'.format(prefetch_time))
+        assert prefetch_time < from_disk_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_append_to_disk():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/append_to_disk.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    batch_size = 100
+    num_batches = int(DIM / batch_size)
+    batch = Container({'a': np.random.uniform(size=(batch_size, 8)).astype(np.float32),
+                       'b': {'c': np.random.randint(0, 10, (batch_size,))}})
+    num_megabytes = num_batches * (batch.a.nbytes + batch.b.c.nbytes) / 1e6
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        filepath = os.path.join(dirpath, 'container.hdf5')
+
+        # one to_disk call per batch, which reopens the file each time
+        start = time.perf_counter()
+        for batch_idx in range(num_batches):
+            batch.to_disk(filepath, starting_index=batch_idx * batch_size, max_batch_size=DIM)
+        to_disk_mbps = num_megabytes / (time.perf_counter() - start)
+        os.remove(filepath)
+
+        results = [('to_disk per batch', to_disk_mbps)]
+        for compression, buffer_size in [(None, 1), (None, 32), ('lzf', 32), ('gzip', 32)]:
+            start = time.perf_counter()
+            with ivy_cont_io.ContainerWriter(filepath, chunks=batch_size * 32, compression=compression,
+                                          buffer_size=buffer_size) as writer:
+                for _ in range(num_batches):
+                    writer.append(batch)
+            mbps = num_megabytes / (time.perf_counter() - start)
+            file_megabytes = os.path.getsize(filepath) / 1e6
+            os.remove(filepath)
+            results.append(('writer compression {} buffer {}, {:.2f}MB file'.format(
+                compression, buffer_size, file_megabytes), mbps))
+
+    for name, mbps in results:
+        append_to_file(fname, '{}: {} MB/s'.format(name, mbps))
+    assert results[2][1] > results[0][1]
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_async_append_to_disk():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/async_append_to_disk.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    batch_size = int(DIM / 10)
+    compute_time = 0.02
+    batch = Container({'a': np.random.uniform(size=(batch_size, 8)).astype(np.float32),
+                       'b': {'c': np.random.randint(0, 10, (batch_size,))}})
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        filepath = os.path.join(dirpath, 'container.hdf5')
+        stall_times = list()
+        for writer_class in [ivy_cont_io.ContainerWriter, ivy_cont_io.AsyncContainerWriter]:
+            # time for which the appending loop is blocked by the writer
+            stall_time = 0.
+            with writer_class(filepath, chunks=batch_size, compression='gzip') as writer:
+                for _ in range(10):
+                    start = time.perf_counter()
+                    writer.append(batch)
+                    stall_time += time.perf_counter() - start
+                    time.sleep(compute_time)
+            stall_times.append(stall_time)
+            os.remove(filepath)
+
+    append_to_file(fname, 'synchronous writer stall: {}'.format(stall_times[0]))
+    append_to_file(fname, 'asynchronous writer stall: {}'.format(stall_times[1]))
+    assert stall_times[1] < stall_times[0]
+
+    append_to_file(fname, 'end of analysis')
+
+
+def _nested_container(num_leaves, branching=10):
+    def _build(prefix, num):
+        if num <= branching:
+            return {'{}_{}'.format(prefix, i): np.ones((1,)) for i in range(num)}
+        return {'{}_{}'.format(prefix, i): _build('{}_{}'.format(prefix, i), num // branching)
+                for i in range(branching)}
+    return Container(_build('k', num_leaves))
+
+
+def test_flat_index():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/flat_index.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    container = _nested_container(int(1e4))
+    key_chain = list(container._flat_index()[1].keys())[-1]
+
+    for method_name, fn in [('to_flat_list', container.to_flat_list),
+                            ('map', lambda: container.map(lambda x, _: x)),
+                            ('key chain access', lambda: container[key_chain])]:
+
+        def _uncached_fn():
+            # a mutation of the container invalidates its cached flat index
+            container._mutated()
+            return fn()
+
+        uncached_time = _time_calls(_uncached_fn)
+        cached_time = _time_calls(fn)
+        append_to_file(fname, '{} uncached: {}'.format(method_name, uncached_time))
+        append_to_file(fname, '{} cached: {}'.format(method_name, cached_time))
+        if method_name != 'map':
+            # map is dominated by constructing the new container
+            assert cached_time < uncached_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_container_ops():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/container_ops.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    # 1296 leaves at depth 4
+    container = _nested_container(6 ** 4, branching=6)
+
+    for method_name, fn in [('map', lambda: container.map(lambda x, _: x)),
+                            ('slice', lambda: container.slice(slice(0, 1))),
+                            ('expand_dims', lambda: container.expand_dims(0)),
+                            ('shuffle', lambda: container.shuffle(0)),
+                            ('copy', container.copy),
+                            ('prune_empty', container.prune_empty)]:
+
+        # the previous behaviour, where every level was rebuilt with the sorting, re-wrapping public constructor
+        from_sorted = Container._from_sorted
+        Container._from_sorted = staticmethod(lambda dict_in: Container(dict_in))
+        try:
+            rebuilding_time = _time_calls(fn)
+        finally:
+            Container._from_sorted = from_sorted
+        fast_time = _time_calls(fn)
+
+        append_to_file(fname, '{} rebuilding: {}'.format(method_name, rebuilding_time))
+        append_to_file(fname, '{} fast: {}'.format(method_name, fast_time))
+        assert fast_time < rebuilding_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_flatten_and_unflatten():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/flatten_and_unflatten.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    container = _nested_container(6 ** 4, branching=6)
+    leaves, treedef = container.flatten()
+    container_dict = container.to_dict()
+
+    def _uncached_flatten():
+        container._mutated()
+        return container.flatten()
+
+    uncached_flatten_time = _time_calls(_uncached_flatten)
+    cached_flatten_time = _time_calls(container.flatten)
+    unflatten_time = _time_calls(lambda: Container.unflatten(treedef, leaves))
+    constructor_time = _time_calls(lambda: Container(container_dict))
+
+    append_to_file(fname, 'flatten uncached: {}'.format(uncached_flatten_time))
+    append_to_file(fname, 'flatten cached: {}'.format(cached_flatten_time))
+    append_to_file(fname, 'unflatten: {}'.format(unflatten_time))
+    append_to_file(fname, 'constructor from nested dict: {}'.format(constructor_time))
+    assert cached_flatten_time < uncached_flatten_time
+    assert unflatten_time < constructor_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def _shuffle_reseeding(container, seed_value, f):
+    # the previous shuffle, which reseeds the global random state and draws a new permutation for every leaf
+    def _shuffle(value, _=''):
+        ivy_rand.seed(seed_value, f=f)
+        return ivy_rand.shuffle(value, f=f)
+    return container.map(_shuffle)
+
+
+def test_shuffle():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/shuffle.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    for lib, call in [(l, c) for l, c in helpers.calls if c not in [helpers.tf_graph_call, helpers.mx_graph_call]]:
+
+        append_to_file(fname, '{}'.format(lib))
+
+        container = Container({str(i): ivy_gen.array(np.random.uniform(size=(DIM // 100, 8)).astype(np.float32),
+                                                     f=lib) for i in range(100)})
+
+        reseeding_time = _time_calls(lambda: _shuffle_reseeding(container, 0, lib))
+        single_permutation_time = _time_calls(lambda: container.shuffle(0))
+
+        append_to_file(fname, 'reseeding per leaf: {}'.format(reseeding_time))
+        append_to_file(fname, 'single permutation: {}'.format(single_permutation_time))
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_unstack():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/unstack.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    dim_size = 1024
+    for lib, call in [(l, c) for l, c in helpers.calls if c not in [helpers.tf_graph_call, helpers.mx_graph_call]]:
+
+        append_to_file(fname, '{}'.format(lib))
+
+        container = _nested_container(100)
+        container = container.map(lambda x, _: ivy_gen.array(np.random.uniform(size=(dim_size, 4)), f=lib))
+
+        def _unstack_via_slices():
+            # the previous unstack, which slices the whole container once per index
+            return [container.slice(slice(i, i + 1, 1)) for i in range(dim_size)]
+
+        slicing_time = _time_calls(_unstack_via_slices, 3)
+        fused_time = _time_calls(lambda: container.unstack(0, dim_size), 3)
+        iterator_time = _time_calls(lambda: next(container.unstack_iterator(0, dim_size)), 3)
+
+        append_to_file(fname, 'slicing per index: {}'.format(slicing_time))
+        append_to_file(fname, 'split per leaf: {}'.format(fused_time))
+        append_to_file(fname, 'first slice from iterator: {}'.format(iterator_time))
+        assert fused_time < slicing_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_pack():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/pack.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    for lib, call in [(l, c) for l, c in helpers.calls if c not in [helpers.tf_graph_call, helpers.mx_graph_call]]:
+
+        append_to_file(fname, '{}'.format(lib))
+
+        container = Container({str(i): ivy_gen.array(np.random.uniform(size=(DIM // 1000, 4)), 'float32', f=lib)
+                               for i in range(500)})
+        packed = container.pack()
+
+        def _transfer(x, _=''):
+            # host round trip, standing in for a device transfer
+            return ivy_gen.array(ivy_gen.to_numpy(x, f=lib), f=lib)
+
+        pack_time = _time_calls(container.pack)
+        per_leaf_transfer_time = _time_calls(lambda: container.map(_transfer))
+        packed_transfer_time = _time_calls(lambda: packed.map_buffers(_transfer))
+        buffers_transfer_time = _time_calls(lambda: [_transfer(buffer) for buffer in packed.buffers.values()])
+        per_leaf_update_time = _time_calls(lambda: container.map(lambda x, _: x * 0.9))
+        packed_update_time = _time_calls(lambda: packed.map_buffers(lambda x, _: x * 0.9))
+
+        with tempfile.TemporaryDirectory() as dirpath:
+            per_leaf_to_disk_time = _time_calls(
+                lambda: container.to_disk(os.path.join(dirpath, 'leaves.hdf5'), mode='w'), 3)
+            packed_to_disk_time = _time_calls(
+                lambda: Container(packed.buffers).to_disk(os.path.join(dirpath, 'packed.hdf5'), mode='w'), 3)
+
+        append_to_file(fname, 'pack: {}'.format(pack_time))
+        append_to_file(fname, 'per leaf transfer: {}'.format(per_leaf_transfer_time))
+        append_to_file(fname, 'packed transfer: {}'.format(packed_transfer_time))
+        append_to_file(fname, 'packed transfer, without recreating the entry views: {}'.format(buffers_transfer_time))
+        append_to_file(fname, 'per leaf update: {}'.format(per_leaf_update_time))
+        append_to_file(fname, 'packed update: {}'.format(packed_update_time))
+        append_to_file(fname, 'per leaf to_disk: {}'.format(per_leaf_to_disk_time))
+        append_to_file(fname, 'packed to_disk: {}'.format(packed_to_disk_time))
+        assert buffers_transfer_time < per_leaf_transfer_time
+        assert packed_to_disk_time < per_leaf_to_disk_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_save_and_load():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/save_and_load.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    container = Container({str(i): np.random.uniform(size=(DIM // 10, 16)).astype(np.float32) for i in range(100)})
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        h5_filepath = os.path.join(dirpath, 'container.hdf5')
+        raw_filepath = os.path.join(dirpath, 'container.bin')
+        npz_filepath = os.path.join(dirpath, 'container.npz')
+        container.to_disk(h5_filepath)
+        container.save(raw_filepath)
+        container.save(npz_filepath, 'npz')
+
+        from_disk_time = _time_calls(lambda: Container.from_disk(h5_filepath, np), 3)
+        raw_mmap_time = _time_calls(lambda: Container.load(raw_filepath), 3)
+        raw_read_time = _time_calls(lambda: Container.load(raw_filepath, mmap=False), 3)
+        npz_time = _time_calls(lambda: Container.load(npz_filepath), 3)
+
+    append_to_file(fname, 'from_disk h5: {}'.format(from_disk_time))
+    append_to_file(fname, 'load raw memory mapped: {}'.format(raw_mmap_time))
+    append_to_file(fname, 'load raw read into memory: {}'.format(raw_read_time))
+    append_to_file(fname, 'load npz: {}'.format(npz_time))
+    assert raw_mmap_time < from_disk_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_incremental_to_disk():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/incremental_to_disk.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    # 10 of the 100 entries change between checkpoints, the others are frozen
+    container = Container({str(i): np.random.uniform(size=(DIM // 10, 16)).astype(np.float32) for i in range(100)})
+    changing_keys = [str(i) for i in range(10)]
+    num_bytes_written = [0]
+    write_h5_dataset = ivy_cont_io._write_h5_dataset
+
+    def _counting_write_h5_dataset(dataset, starting_index, value):
+        num_bytes_written[0] += value.nbytes
+        write_h5_dataset(dataset, starting_index, value)
+
+    def _checkpoint(filepath, incremental):
+        for key in changing_keys:
+            container[key] = container[key] + 1
+        num_bytes_written[0] = 0
+        container.to_disk(filepath, incremental=incremental)
+
+    ivy_cont_io._write_h5_dataset = _counting_write_h5_dataset
+    try:
+        with tempfile.TemporaryDirectory() as dirpath:
+            full_filepath = os.path.join(dirpath, 'full.hdf5')
+            incremental_filepath = os.path.join(dirpath, 'incremental.hdf5')
+            container.to_disk(full_filepath)
+            container.to_disk(incremental_filepath, incremental=True)
+
+            full_time = _time_calls(lambda: _checkpoint(full_filepath, False), 5)
+            full_bytes = num_bytes_written[0]
+            incremental_time = _time_calls(lambda: _checkpoint(incremental_filepath, True), 5)
+            incremental_bytes = num_bytes_written[0]
+    finally:
+        ivy_cont_io._write_h5_dataset = write_h5_dataset
+
+    append_to_file(fname, 'full checkpoint: {}s, {} bytes written'.format(full_time, full_bytes))
+    append_to_file(fname, 'incremental checkpoint: {}s, {} bytes written'.format(incremental_time, incremental_bytes))
+    assert incremental_bytes * 5 < full_bytes
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_h5_metadata():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/h5_metadata.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    container = _nested_container(1000)
+
+    with tempfile.TemporaryDirectory() as dirpath:
+        filepath = os.path.join(dirpath, 'container.hdf5')
+        container.to_disk(filepath)
+
+        def _uncached_h5_file_size():
+            ivy_cont_io._h5_metadata_cache.clear()
+            return Container.h5_file_size(filepath)
+
+        uncached_time = _time_calls(_uncached_h5_file_size)
+        cached_time = _time_calls(lambda: Container.h5_file_size(filepath))
+
+    append_to_file(fname, 'h5_file_size uncached: {}'.format(uncached_time))
+    append_to_file(fname, 'h5_file_size cached: {}'.format(cached_time))
+    assert cached_time < uncached_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def _python_sum(x, _=''):
+    # holds the GIL throughout
+    total = 0.
+    for value in x.reshape(-1)[:20000].tolist():
+        total += value
+    return total
+
+
+def test_parallel_map():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/container/parallel_map.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    append_to_file(fname, 'cpu count: {}'.format(os.cpu_count()))
+    container = Container({str(i): np.random.uniform(size=(DIM, 4)) for i in range(32)})
+
+    # numpy sorting releases the GIL, so scales with threads
+    sequential_time = _time_calls(lambda: container.map(lambda x, _: np.sort(x, 0)), 3)
+    append_to_file(fname, 'sort, sequential: {}'.format(sequential_time))
+    for max_workers in [1, 2, 4, 8]:
+        thread_time = _time_calls(lambda: container.map(lambda x, _: np.sort(x, 0), parallel=True,
+                                                        max_workers=max_workers), 3)
+        append_to_file(fname, 'sort, {} threads: {}'.format(max_workers, thread_time))
+
+    # pure python functions hold the GIL, so only scale with processes
+    sequential_time = _time_calls(lambda: container.map(_python_sum), 3)
+    append_to_file(fname, 'python sum, sequential: {}'.format(sequential_time))
+    for max_workers in [1, 2, 4, 8]:
+        process_time = _time_calls(lambda: container.map(_python_sum, parallel=True, max_workers=max_workers,
+                                                         processes=True), 3)
+        append_to_file(fname, 'python sum, {} processes: {}'.format(max_workers, process_time))
+
+    assert container.map(_python_sum, parallel=True, max_workers=2, processes=True).to_flat_list() == \
+        container.map(_python_sum).to_flat_list()
+
+    append_to_file(fname, 'end of analysis')
@@ -0,0 +1,96 @@
+"""
+Collection of runtime tests for framework dispatch
+"""
+
+DIM = int(1e1)
+
+
+# global
+import os
+import time
+import numpy as np
+
+# local
+import ivy.core.general as ivy_gen
+import ivy.core.reductions as ivy_red
+import ivy.framework_handler as framework_handler
+this_file_dir = os.path.dirname(os.path.realpath(__file__))
+
+# local
+import ivy_tests.helpers as helpers
+from test_runtime.utils import append_to_file
+
+
+def _time_calls(fn, args, num_calls=1000):
+    times = list()
+    for _ in range(num_calls):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return np.median(np.asarray(times))
+
+
+def _time_dispatch(args, clear_cache, num_calls=1000):
+    times = list()
+    for _ in range(num_calls):
+        if clear_cache:
+            framework_handler._framework_cache.clear()
+        start = time.perf_counter()
+        framework_handler.get_framework(*args)
+        times.append(time.perf_counter() - start)
+    return np.median(np.asarray(times))
+
+
+def test_get_framework():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/framework_handler/get_framework.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    for lib, call in [(l, c) for l, c in helpers.calls if c not in [helpers.tf_graph_call, helpers.mx_graph_call]]:
+
+        append_to_file(fname, '{}'.format(lib))
+
+        x = ivy_gen.array(np.random.uniform(size=(DIM,)), f=lib)
+        for args in [(x,), ([x, x], x), ({'a': x, 'b': [x]},)]:
+
+            # warm up the import machinery and the type cache
+            framework_handler.get_framework(*args)
+
+            uncached_time = _time_dispatch(args, clear_cache=True)
+            cached_time = _time_dispatch(args, clear_cache=False)
+
+            append_to_file(fname, 'uncached: {}'.format(uncached_time))
+            append_to_file(fname, 'cached: {}'.format(cached_time))
+            assert cached_time < uncached_time
+
+    append_to_file(fname, 'end of analysis')
+
+
+def test_pinned_framework():
+
+    fname = os.path.join(this_file_dir, 'runtime_analysis/{}/framework_handler/pin.txt'.format(DIM))
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    if os.path.exists(fname):
+        os.remove(fname)
+    for lib, call in [(l, c) for l, c in helpers.calls if c not in [helpers.tf_graph_call, helpers.mx_graph_call]]:
+
+        append_to_file(fname, '{}'.format(lib))
+
+        pinned = framework_handler.pin(lib)
+        x = ivy_gen.array(np.random.uniform(size=(DIM,)), f=lib)
+        for method_name, wrapper_fn, args in [('reduce_sum', ivy_red.reduce_sum, (x,)),
+                                              ('minimum', ivy_gen.minimum, (x, x)),
+                                              ('expand_dims', ivy_gen.expand_dims, (x, 0))]:
+
+            pinned_fn = getattr(pinned, method_name)
+            wrapper_fn(*args)
+            pinned_fn(*args)
+
+            wrapper_time = _time_calls(wrapper_fn, args)
+            pinned_time = _time_calls(pinned_fn, args)
+
+            append_to_file(fname, '{} wrapper: {}'.format(method_name, wrapper_time))
+            append_to_file(fname, '{} pinned: {}'.format(method_name, pinned_time))
+
+    append_to_file(fname, 'end of analysis')